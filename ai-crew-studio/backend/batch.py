@@ -0,0 +1,99 @@
+"""
+Batch Runner - Tek ekip tanımını birden çok konu için çalıştırma
+"""
+
+import time
+import asyncio
+from datetime import datetime
+from concurrent.futures import Executor
+from typing import Callable, List, Optional
+
+from cancellation import CancelToken, CrewCancelled
+from crew_manager import CrewManager
+from result_files import ResultFiles
+
+
+def topic_result_key(batch_id: str, index: int) -> str:
+    """ResultFiles key of the result of topic ``index`` of a batch"""
+    return f"{batch_id}_{index + 1:02d}"
+
+
+async def run_batch(crew_manager: CrewManager, topics: List[str], max_parallel: int = 2,
+                    callback: Optional[Callable] = None,
+                    executor: Optional[Executor] = None,
+                    cancel_token: Optional[CancelToken] = None,
+                    results: Optional[ResultFiles] = None,
+                    batch_id: str = "") -> dict:
+    """Run the crew of ``crew_manager`` once per topic and return a manifest.
+
+    At most ``max_parallel`` topics run at a time. Every run is a fork of
+    ``crew_manager``, so the LLM client is built once for the whole batch.
+    Events passed to ``callback`` carry ``topic_index`` and ``topic``. A
+    failing topic is recorded in the manifest and does not stop the others.
+    Every run checks ``cancel_token``; topics it stops are marked cancelled.
+    With ``results`` each topic's result is written there under
+    ``topic_result_key(batch_id, index)`` and the manifest only records its
+    size; without it the result text is kept in the manifest.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    started = time.perf_counter()
+
+    def emit(event: dict):
+        if callback:
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    async def run_topic(index: int, topic: str) -> dict:
+        def tagged(event: dict):
+            emit({**event, "topic_index": index, "topic": topic})
+
+        async with semaphore:
+            item = {"index": index, "topic": topic}
+            tagged({
+                "type": "topic_started",
+                "timestamp": datetime.now().isoformat(),
+                "message": f"📄 Konu {index + 1}/{len(topics)} başladı: {topic}"
+            })
+            topic_started = time.perf_counter()
+            try:
+                result = await crew_manager.fork(tagged).run(
+                    topic,
+                    executor=executor,
+                    output_file=f"output_{stamp}_{index + 1:02d}.md",
+                    cancel_token=cancel_token
+                )
+                if results is None:
+                    item.update(status="completed", result=result, result_size=len(result.encode("utf-8")))
+                else:
+                    size = await asyncio.to_thread(results.write, topic_result_key(batch_id, index), result)
+                    item.update(status="completed", result_size=size)
+            except CrewCancelled as e:
+                item.update(status="cancelled", error=e.reason)
+            except Exception as e:
+                item.update(status="error", error=str(e))
+            item["duration"] = round(time.perf_counter() - topic_started, 3)
+
+            done = item["status"] == "completed"
+            tagged({
+                "type": "topic_completed" if done else "topic_failed",
+                "timestamp": datetime.now().isoformat(),
+                "duration": item["duration"],
+                "error": item.get("error"),
+                "message": (f"✅ Konu {index + 1}/{len(topics)} tamamlandı: {topic}" if done
+                            else f"❌ Konu {index + 1}/{len(topics)} başarısız: {item['error']}")
+            })
+            return item
+
+    items = await asyncio.gather(*(run_topic(i, topic) for i, topic in enumerate(topics)))
+    completed = sum(1 for item in items if item["status"] == "completed")
+    return {
+        "topics": len(topics),
+        "completed": completed,
+        "failed": len(topics) - completed,
+        "max_parallel": max_parallel,
+        "wall_time": round(time.perf_counter() - started, 3),
+        "items": list(items)
+    }
@@ -0,0 +1,349 @@
+"""
+Benchmark - Sahte LLM ve arama/scraper ile çevrimdışı yük testi
+
+Starts the backend in this process with Gemini's API calls, DuckDuckGo and
+the page fetcher's HTTP session replaced by deterministic local stand-ins
+(the rate limiter, LLM cache and crewai adapter stay real), then runs
+N sessions through the same REST + WebSocket flow as the frontend.
+
+    python benchmark.py --sessions 50 --concurrency 10 --llm-latency 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+import aiohttp
+
+
+# --- Stand-ins ---
+
+class FakeDDGS:
+    """DDGS replacement returning fixed results after ``latency`` seconds"""
+    latency = 0.02
+
+    def text(self, query: str, max_results: int = 3) -> Iterator[dict]:
+        time.sleep(self.latency)
+        for i in range(max_results):
+            yield {
+                "title": f"{query} - sonuç {i + 1}",
+                "body": f"{query} hakkında örnek içerik {i + 1}. " * 5,
+                "href": f"http://bench.local/{i + 1}"
+            }
+
+
+class _FakeResponse:
+    status_code = 200
+    encoding = "utf-8"
+
+    def __init__(self, url: str):
+        self.headers = {"Content-Type": "text/html; charset=utf-8", "ETag": f'"{abs(hash(url))}"'}
+        body = "".join(f"<p>Paragraf {i}: {url} için örnek metin.</p>" for i in range(200))
+        self._body = f"<html><body><h1>{url}</h1>{body}</body></html>".encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int = 16 * 1024):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+
+class FakeHTTPSession:
+    """Stands in for the page fetcher's requests.Session"""
+    latency = 0.02
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout: float = None, stream: bool = False):
+        time.sleep(self.latency)
+        return _FakeResponse(url)
+
+
+def _fake_reply(messages, tokens: int) -> str:
+    """ReAct text a Gemini agent would answer ``messages`` with.
+
+    An agent with the search tool asks for a search before its first answer;
+    every other call returns a final answer of ``tokens`` words.
+    """
+    from langchain_core.messages import AIMessage
+
+    prompt = "\n".join(str(m.content) for m in messages if not isinstance(m, AIMessage))
+    # CrewAI 1.x lists tools by a sanitized name, older versions by the tool's name
+    tool = next((name for name in ("internet_search", "Internet Search") if name in prompt), None)
+    # Tool results come back after an assistant turn
+    if tool and not any(isinstance(m, AIMessage) for m in messages):
+        return (f'Thought: Önce konuyu aramalıyım.\nAction: {tool}\n'
+                'Action Input: {"query": "benchmark"}')
+    words = " ".join(f"kelime{i}" for i in range(tokens))
+    return f"Thought: I now know the final answer\nFinal Answer: {words}"
+
+
+def make_fake_transport(latency: float, tokens: int):
+    """``_generate``/``_stream`` for ``ChatGoogleGenerativeAI`` that answer without the network.
+
+    Only the HTTP call is replaced: RateLimitedGemini's quota limiter and
+    retries, the disk LLM cache, CrewChatModel and token streaming all run as
+    they do against Gemini. Answers take ``latency`` seconds, streamed one
+    word at a time, and report usage metadata like the API does.
+    """
+    from langchain_core.messages import AIMessage, AIMessageChunk
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+    def usage(messages, text: str) -> dict:
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(text.split(" "))
+        return {"input_tokens": prompt_tokens, "output_tokens": output_tokens,
+                "total_tokens": prompt_tokens + output_tokens}
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = _fake_reply(messages, tokens)
+        time.sleep(latency)
+        message = AIMessage(content=text, usage_metadata=usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def fake_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        text = _fake_reply(messages, tokens)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(latency / len(words))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if i == len(words) - 1 else word + " "))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage(messages, text)))
+
+    return fake_generate, fake_stream
+
+
+def install_fakes(llm_latency: float, tool_latency: float, tokens: int):
+    """Swap the external services used by crew_manager for the stand-ins"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    import crew_manager
+    import search_client
+
+    FakeDDGS.latency = tool_latency
+    FakeHTTPSession.latency = tool_latency
+    search_client.DDGS = FakeDDGS
+    crew_manager.page_fetcher.session = FakeHTTPSession()
+    # Everything above Gemini's HTTP API runs for real
+    ChatGoogleGenerativeAI._generate, ChatGoogleGenerativeAI._stream = make_fake_transport(llm_latency, tokens)
+
+
+# --- Load generator ---
+
+AGENTS = [
+    {"name": "Araştırmacı", "role": "Araştırmacı", "goal": "Konuyu araştırmak",
+     "backstory": "Deneyimli araştırmacı", "tools": ["internet_search", "web_scraper"]},
+    {"name": "Yazar", "role": "Yazar", "goal": "Blog yazısı yazmak",
+     "backstory": "Deneyimli yazar", "tools": []},
+]
+
+TASKS = [
+    {"description": "{topic} hakkında araştırma yap", "expected_output": "Rapor", "agent_name": "Araştırmacı"},
+    {"description": "{topic} hakkında yazı yaz", "expected_output": "Blog yazısı", "agent_name": "Yazar"},
+]
+
+
+def _event_time(event: dict) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(event["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _flatten(frame: dict) -> List[dict]:
+    if frame.get("type") == "batch":
+        return [e for event in frame["events"] for e in _flatten(event)]
+    return [frame]
+
+
+async def _post(http: aiohttp.ClientSession, url: str, payload=None) -> dict:
+    async with http.post(url, json=payload) as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def run_session(http: aiohttp.ClientSession, base_url: str, index: int, timeout: float) -> dict:
+    """One full session: wizard steps, WebSocket, start, wait for the result"""
+    session_id = (await _post(http, f"{base_url}/api/sessions"))["session_id"]
+    session_url = f"{base_url}/api/sessions/{session_id}"
+    await _post(http, f"{session_url}/api-key", {"api_key": "benchmark"})
+    await _post(http, f"{session_url}/agents", AGENTS)
+    await _post(http, f"{session_url}/model", {"model_id": "gemini-2.0-flash"})
+    await _post(http, f"{session_url}/tasks", TASKS)
+
+    lags: List[float] = []
+    events = 0
+    status = "timeout"
+    ws_url = base_url.replace("http", "ws", 1) + f"/ws/{session_id}"
+    async with http.ws_connect(ws_url, max_msg_size=0) as ws:
+        started = time.time()
+        async with http.post(f"{session_url}/start",
+                             json={"topic": f"Konu {index}", "use_cache": True}) as response:
+            if response.status != 200:
+                return {"status": f"http_{response.status}", "latency": None, "lags": [], "events": 0}
+
+        async def receive():
+            nonlocal events, status
+            async for message in ws:
+                received = time.time()
+                for event in _flatten(json.loads(message.data)):
+                    events += 1
+                    sent = _event_time(event)
+                    if sent is not None:
+                        lags.append(received - sent)
+                    if event.get("type") == "error":
+                        status = "error"
+                    elif event.get("type") == "crew_completed" and "download_url" in event:
+                        status = "completed"
+                if status != "timeout":
+                    return
+
+        try:
+            await asyncio.wait_for(receive(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return {"status": status, "latency": time.time() - started, "lags": lags, "events": events}
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))], 4)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def run_load(base_url: str, sessions: int, concurrency: int, timeout: float) -> List[dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index: int) -> dict:
+        async with semaphore:
+            return await run_session(http, base_url, index, timeout)
+
+    async with aiohttp.ClientSession() as http:
+        return await asyncio.gather(*(limited(i) for i in range(sessions)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int):
+    import uvicorn
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="benchmark-server", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def report(results: List[dict], wall_time: float, rss_growth: int) -> dict:
+    completed = [r for r in results if r["status"] == "completed"]
+    latencies = [r["latency"] for r in completed]
+    lags = [lag for r in results for lag in r["lags"]]
+    return {
+        "sessions": len(results),
+        "completed": len(completed),
+        "failed": {status: sum(1 for r in results if r["status"] == status)
+                   for status in {r["status"] for r in results} if status != "completed"},
+        "wall_time": round(wall_time, 3),
+        "throughput_per_min": round(len(completed) / wall_time * 60, 2) if wall_time else 0.0,
+        "latency_p50": _percentile(latencies, 0.50),
+        "latency_p99": _percentile(latencies, 0.99),
+        "events": sum(r["events"] for r in results),
+        "event_lag_p50": _percentile(lags, 0.50),
+        "event_lag_p99": _percentile(lags, 0.99),
+        "event_lag_mean": round(statistics.fmean(lags), 4) if lags else None,
+        "memory_per_session_kb": round(rss_growth / len(results) / 1024, 1) if results else 0.0
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="AI Crew Studio offline benchmark")
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions to run")
+    parser.add_argument("--concurrency", type=int, default=5, help="Sessions in flight at once")
+    parser.add_argument("--workers", type=int, default=4, help="CREW_MAX_WORKERS of the server")
+    parser.add_argument("--store", choices=("sqlite", "memory"), default="sqlite")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Seconds per fake LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.02, help="Seconds per fake search/fetch")
+    parser.add_argument("--tokens", type=int, default=200, help="Words in each fake LLM answer")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-session timeout in seconds")
+    parser.add_argument("--json", help="Also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="crew-bench-")
+
+    # Server configuration must be in place before main is imported
+    os.environ.update({
+        "CREW_MAX_WORKERS": str(args.workers),
+        "CREW_MAX_QUEUE": str(max(args.sessions, 32)),
+        # The stand-ins are patched into this process only
+        "CREW_EXECUTOR": "thread",
+        "SESSION_STORE": args.store,
+        "SESSION_DB_PATH": os.path.join(workdir, "sessions.db"),
+        "RESULT_DIR": os.path.join(workdir, "results"),
+        # Every session has its own topic, so the cache is looked up and written but never hit
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.db"),
+        "LLM_RATE_RPM": "1000000000",
+        "LLM_RATE_TPM": "1000000000000",
+        "SEARCH_RATE_PER_SECOND": "1000000",
+        "SEARCH_CACHE_TTL": "0",
+        "PAGE_CACHE_DIR": "",
+    })
+    # CrewAI telemetry would add network timeouts to every run
+    for name, value in (("CREWAI_DISABLE_TELEMETRY", "true"), ("CREWAI_TRACING_ENABLED", "false"),
+                        ("OTEL_SDK_DISABLED", "true")):
+        os.environ.setdefault(name, value)
+    install_fakes(args.llm_latency, args.tool_latency, args.tokens)
+
+    port = _free_port()
+    server, thread = start_server(port)
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run_load(f"http://127.0.0.1:{port}", args.sessions, args.concurrency, args.timeout))
+    finally:
+        wall_time = time.perf_counter() - started
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    summary = report(results, wall_time, _rss_bytes() - rss_before)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+if __name__ == "__main__":
+    summary = main()
+    sys.exit(0 if summary["completed"] == summary["sessions"] else 1)
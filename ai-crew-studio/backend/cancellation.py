@@ -0,0 +1,69 @@
+"""
+Cancellation - Çalışan ekiplerin iş birliğine dayalı iptali ve süre sınırı
+"""
+
+import time
+import threading
+import contextvars
+from typing import Optional
+
+
+class CrewCancelled(BaseException):
+    """Raised at a checkpoint of a crew that was cancelled or ran out of time.
+
+    Like ``asyncio.CancelledError`` it is not an ``Exception``, so the broad
+    ``except Exception`` retries inside CrewAI and LangChain let it through.
+    """
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """Cancellation flag and optional deadline shared by the threads of one crew.
+
+    ``event`` may be a ``multiprocessing.Manager().Event()`` proxy so a crew
+    in a worker process sees cancellation too. ``deadline`` is a
+    ``time.time()`` value, which is comparable across processes.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, event=None):
+        self.deadline = deadline
+        self.event = event if event is not None else threading.Event()
+        self._reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled"):
+        if self._reason is None:
+            self._reason = reason
+        self.event.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._reason is not None:
+            return self._reason
+        if self.event.is_set():
+            return "cancelled"
+        if self.deadline is not None and time.time() >= self.deadline:
+            return "timeout"
+        return None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one"""
+        return None if self.deadline is None else max(0.0, self.deadline - time.time())
+
+    def check(self):
+        reason = self.reason
+        if reason is not None:
+            raise CrewCancelled(reason)
+
+
+# Token of the crew running in the current thread
+current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar("cancel_token", default=None)
+
+
+def check_cancelled():
+    """Checkpoint: raise CrewCancelled if the crew of this thread should stop"""
+    token = current_token.get()
+    if token is not None:
+        token.check()
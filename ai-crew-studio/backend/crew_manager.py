@@ -3,21 +3,100 @@ CrewAI Manager - Agent ve Task yönetimi
 """
 
 import os
+import time
 import asyncio
-from typing import List, Optional, Callable, Any
+import hashlib
+import contextvars
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
-from crewai import Agent, Task, Crew, Process
-from langchain_google_genai import ChatGoogleGenerativeAI
-from crewai.tools import BaseTool
-try:
-    from ddgs import DDGS
-except ImportError:
-    from duckduckgo_search import DDGS
+from caching import ObjectPool
+from cancellation import CancelToken, check_cancelled, current_token
+from search_client import SearchClient, load_ddgs
+from web_fetch import PageFetcher
+from task_graph import critical_path, resolve_dependencies
+from event_log import EventLog, EventRecord
+import tracing
+
+# CrewAI, LangChain and DuckDuckGo load on the first crew run (or in prewarm)
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from llm_cache import DiskLLMCache
 
 # Environment setup
 os.environ.setdefault("OPENAI_API_KEY", "NA")
 
+# Upper bound on tasks of one crew running at the same time (dependency mode)
+CREW_MAX_PARALLEL_TASKS = int(os.environ.get("CREW_MAX_PARALLEL_TASKS", "4"))
+
+# LLM response cache
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Shared search client; identical queries from concurrent crews hit DuckDuckGo once
+search_client = SearchClient(
+    ttl_seconds=float(os.environ.get("SEARCH_CACHE_TTL", "600")),
+    rate_per_second=float(os.environ.get("SEARCH_RATE_PER_SECOND", "1.0"))
+)
+
+# Shared page fetcher with pooled connections and an on-disk page cache
+page_fetcher = PageFetcher(
+    cache_dir=os.environ.get("PAGE_CACHE_DIR", "page_cache"),
+    max_bytes=int(os.environ.get("PAGE_MAX_BYTES", str(512 * 1024))),
+    cache_ttl_seconds=float(os.environ.get("PAGE_CACHE_TTL", str(7 * 24 * 3600))),
+    max_cache_bytes=int(os.environ.get("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
+
+# LLM clients reused across sessions with the same model, key and settings
+llm_pool = ObjectPool(
+    idle_seconds=float(os.environ.get("LLM_POOL_IDLE_SECONDS", "600")),
+    max_entries=int(os.environ.get("LLM_POOL_MAX_SIZE", "32"))
+)
+
+# Shared quota per API key and model, across every session of the process
+LLM_RATE_RPM = float(os.environ.get("LLM_RATE_RPM", "15"))
+LLM_RATE_TPM = float(os.environ.get("LLM_RATE_TPM", "1000000"))
+LLM_QUOTA_RETRIES = int(os.environ.get("LLM_QUOTA_RETRIES", "5"))
+
+# Tool names agents may use; crew_tools.TOOL_REGISTRY builds the tools on the first run
+TOOL_NAMES = ("internet_search", "web_scraper")
+
+LLM_SETTINGS = {
+    "temperature": 0.7,
+    "max_output_tokens": 2048,
+}
+
+def llm_cache() -> Optional["DiskLLMCache"]:
+    """The shared LLM response cache, or None when disabled"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    from llm_cache import get_llm_cache
+    return get_llm_cache(LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES)
+
+def prewarm() -> float:
+    """Import the crew stack ahead of the first run; returns the seconds it took"""
+    started = time.perf_counter()
+    import crewai  # noqa: F401
+    import crew_tools  # noqa: F401
+    import gemini_llm  # noqa: F401
+    load_ddgs()
+    llm_cache()
+    return time.perf_counter() - started
+
+# (callback, agent name) of the task running in the current thread; tools report to it
+_active_agent: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar("active_agent", default=None)
+
+def _report_tool_call(tool: str, started: float, cached: bool = False, error: Optional[str] = None):
+    active = _active_agent.get()
+    if active is not None:
+        callback, agent_name = active
+        callback.tool_call(agent_name, tool, time.perf_counter() - started, cached, error)
+
 @dataclass
 class AgentConfig:
     name: str
@@ -31,76 +110,24 @@ class TaskConfig:
     description: str
     expected_output: str
     agent_name: str
-
-class InternetSearchTool(BaseTool):
-    """DuckDuckGo internet search tool"""
-    name: str = "Internet Search"
-    description: str = "İnternette güncel konuları aramak için kullanılır. Query parametresi ile arama terimi al."
-
-    def _run(self, query: str) -> str:
-        try:
-            # Try with DDGS context manager
-            try:
-                ddgs = DDGS()
-                results = list(ddgs.text(query, max_results=3))
-            except:
-                # Fallback to direct instantiation
-                results = list(DDGS().text(query, max_results=3))
-            
-            if not results:
-                return "Arama sonucu bulunamadı. Lütfen farklı anahtar kelimeler deneyin."
-            
-            # Format results nicely
-            formatted = []
-            for i, r in enumerate(results, 1):
-                formatted.append(f"{i}. {r.get('title', 'No title')}\n{r.get('body', 'No description')[:200]}...\nURL: {r.get('href', '')}")
-            
-            return "\n\n".join(formatted)
-        except Exception as e:
-            return f"Arama sırasında hata oluştu: {str(e)}. Farklı bir arama terimi deneyin."
-
-class WebScraperTool(BaseTool):
-    """Simple web scraper tool"""
-    name: str = "Web Scraper"
-    description: str = "Web sayfalarından içerik çekmek için kullanılır."
-
-    def _run(self, url: str) -> str:
-        try:
-            import requests
-            from bs4 import BeautifulSoup
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Get main text content
-            for script in soup(["script", "style"]):
-                script.decompose()
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            return text[:3000]  # Limit to 3000 chars
-        except Exception as e:
-            return f"Scraping hatası: {str(e)}"
-
-# Tool registry
-TOOL_REGISTRY = {
-    "internet_search": InternetSearchTool(),
-    "web_scraper": WebScraperTool(),
-}
+    # Indices of tasks whose output this task needs. None: the previous task
+    depends_on: Optional[List[int]] = None
 
 class CrewCallback:
     """Custom callback for tracking crew execution"""
     
     def __init__(self, callback_fn: Optional[Callable] = None):
         self.callback_fn = callback_fn
-        self.logs = []
+        self.logs = EventLog()
     
     def log(self, message_type: str, data: dict):
-        log_entry = {
-            "type": message_type,
-            "timestamp": datetime.now().isoformat(),
-            **data
-        }
-        self.logs.append(log_entry)
+        # Kept as a compact record; the dict (and its message) is built once to emit it
+        record = EventRecord(message_type, data, time.time())
+        self.logs.append(record)
+        if self.callback_fn:
+            self._emit(record.to_dict())
+    
+    def _emit(self, log_entry: dict):
         if self.callback_fn:
             # Call callback in a non-blocking way
             try:
@@ -112,38 +139,77 @@ class CrewCallback:
     def agent_started(self, agent_name: str, task_description: str):
         self.log("agent_started", {
             "agent": agent_name,
-            "task": task_description,
-            "message": f"🤖 {agent_name} göreve başladı"
+            "task": task_description
         })
     
     def agent_thinking(self, agent_name: str, thought: str):
         self.log("agent_thinking", {
             "agent": agent_name,
-            "thought": thought[:200],
-            "message": f"💭 {agent_name} düşünüyor..."
+            "thought": thought[:200]
+        })
+    
+    def agent_token(self, agent_name: str, token: str):
+        # Streamed tokens are forwarded live but not kept in the log
+        self._emit({
+            "type": "agent_token",
+            "agent": agent_name,
+            "token": token
+        })
+    
+    def task_output(self, task_index: int, agent_name: str, output: str):
+        # Full task output for checkpoints; forwarded but not kept in the log
+        self._emit({
+            "type": "task_output",
+            "task_index": task_index,
+            "agent": agent_name,
+            "output": output
+        })
+    
+    def rate_limited(self, agent_name: str, wait_seconds: float, attempt: int = 0):
+        self.log("rate_limited", {
+            "agent": agent_name,
+            "wait_seconds": round(wait_seconds, 2),
+            "attempt": attempt
+        })
+    
+    def llm_call(self, agent_name: str, duration: float, prompt_tokens: int,
+                 completion_tokens: int, cached: bool = False):
+        self.log("llm_call", {
+            "agent": agent_name,
+            "duration": round(duration, 3),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached": cached
+        })
+    
+    def tool_call(self, agent_name: str, tool: str, duration: float,
+                  cached: bool = False, error: Optional[str] = None):
+        self.log("tool_call", {
+            "agent": agent_name,
+            "tool": tool,
+            "duration": round(duration, 3),
+            "cached": cached,
+            "error": error
         })
     
     def agent_action(self, agent_name: str, action: str, tool: str = None):
         self.log("agent_action", {
             "agent": agent_name,
             "action": action,
-            "tool": tool,
-            "message": f"⚡ {agent_name}: {action}"
+            "tool": tool
         })
     
     def agent_completed(self, agent_name: str, output: str):
         self.log("agent_completed", {
             "agent": agent_name,
-            "output": output[:500],
-            "message": f"✅ {agent_name} görevini tamamladı"
+            "output": output[:500]
         })
     
     def agent_communication(self, from_agent: str, to_agent: str, message: str):
         self.log("agent_communication", {
             "from": from_agent,
             "to": to_agent,
-            "content": message[:200],
-            "message": f"💬 {from_agent} → {to_agent}"
+            "content": message[:200]
         })
 
 class CrewManager:
@@ -151,34 +217,71 @@ class CrewManager:
     
     def __init__(self, model_name: str = "gemini-2.0-flash-lite", 
                  callback: Optional[Callable] = None,
-                 api_key: Optional[str] = None):
+                 api_key: Optional[str] = None,
+                 use_cache: bool = True,
+                 llm: Optional["ChatGoogleGenerativeAI"] = None):
         self.model_name = model_name
+        self.use_cache = use_cache
+        # The key only ever reaches the LLM client; the process environment is
+        # shared by every session of this worker and is never written
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
         
-        # Set environment variables for CrewAI/LangChain compatibility
-        if self.api_key:
-            os.environ["GOOGLE_API_KEY"] = self.api_key
-            os.environ["GEMINI_API_KEY"] = self.api_key
-        
-        self.agents: List[Agent] = []
-        self.tasks: List[Task] = []
+        self.agents: List["Agent"] = []
+        self.tasks: List["Task"] = []
         self.agent_configs: List[AgentConfig] = []
         self.task_configs: List[TaskConfig] = []
         self.callback = CrewCallback(callback)
-        self._init_llm()
+        # Per task index: [start, end] in perf_counter seconds
+        self._task_times: Dict[int, List[Optional[float]]] = {}
+        self._run_started = 0.0
+        self._cancel_token: Optional[CancelToken] = None
+        # Task index -> output kept from an earlier run of this crew
+        self._restored: Dict[int, str] = {}
+        self.llm = llm
+        if llm is None:
+            self._init_llm()
+    
+    def fork(self, callback: Optional[Callable] = None) -> "CrewManager":
+        """A manager with the same agents and tasks for another run.
+        
+        The LLM client is shared; agents and tasks are rebuilt so runs of the
+        fork never see this manager's per-run state.
+        """
+        clone = CrewManager(self.model_name, callback, self.api_key, self.use_cache, llm=self.llm)
+        for config in self.agent_configs:
+            clone.add_agent(config)
+        for config in self.task_configs:
+            clone.add_task(config)
+        return clone
     
     def _init_llm(self):
         """Initialize the LLM"""
         if not self.api_key:
             raise ValueError("Google API key is required. Please set it in Settings.")
         
-        self.llm = ChatGoogleGenerativeAI(
+        # The key is hashed so the pool never holds it in its keys
+        key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()
+        pool_key = (self.model_name, key_hash, self.use_cache, tuple(sorted(LLM_SETTINGS.items())))
+        self.llm = llm_pool.get(pool_key, self._build_llm)
+    
+    def _build_llm(self) -> "ChatGoogleGenerativeAI":
+        from gemini_llm import RateLimitedGemini
+        
+        # cache=False also bypasses any global LangChain cache
+        cache = llm_cache() if self.use_cache else None
+        
+        return RateLimitedGemini(
             model=self.model_name,
             verbose=True,
-            temperature=0.7,
-            max_output_tokens=2048,
+            **LLM_SETTINGS,
+            rpm=LLM_RATE_RPM,
+            tpm=LLM_RATE_TPM,
+            quota_retries=LLM_QUOTA_RETRIES,
+            # Quota errors are retried by RateLimitedGemini, which backs off every caller
+            max_retries=1,
             google_api_key=self.api_key,
             convert_system_message_to_human=True,
+            cache=cache if cache is not None else False,
             safety_settings={
                 "HARM_CATEGORY_DANGEROUS_CONTENT": "BLOCK_NONE",
                 "HARM_CATEGORY_HATE_SPEECH": "BLOCK_NONE",
@@ -187,33 +290,50 @@ class CrewManager:
             }
         )
     
+    def _agent_llm(self, agent_name: str):
+        """crewai LLM for ``agent_name``: a streaming view of the shared client that reports as that agent"""
+        from crew_tools import TokenStreamHandler
+        from gemini_llm import CrewChatModel
+        
+        # Shallow copy: the underlying client and its connections are shared
+        chat_model = self.llm.model_copy(update={
+            "streaming": True,
+            "callbacks": [TokenStreamHandler(self.callback, agent_name)]
+        })
+        return CrewChatModel(model=self.model_name, chat_model=chat_model)
+    
     def add_agent(self, config: AgentConfig):
         """Add an agent from config"""
+        from crewai import Agent
+        from crew_tools import TOOL_REGISTRY
+        
         tools = [TOOL_REGISTRY[t] for t in config.tools if t in TOOL_REGISTRY]
         
-        agent = Agent(
-            role=config.role,
-            goal=config.goal,
-            backstory=config.backstory,
-            verbose=True,
-            allow_delegation=False,
-            tools=tools,
-            llm=self.llm
-        )
+        with tracing.span("crew.add_agent", agent=config.name):
+            agent = Agent(
+                role=config.role,
+                goal=config.goal,
+                backstory=config.backstory,
+                verbose=True,
+                allow_delegation=False,
+                tools=tools,
+                llm=self._agent_llm(config.name)
+            )
         
         self.agents.append(agent)
         self.agent_configs.append(config)
         
         self.callback.log("agent_added", {
             "agent": config.name,
-            "role": config.role,
-            "message": f"Ajan eklendi: {config.name}"
+            "role": config.role
         })
         
         return agent
     
     def add_task(self, config: TaskConfig):
         """Add a task from config"""
+        from crewai import Task
+        
         # Find the agent for this task
         agent_idx = None
         for i, ac in enumerate(self.agent_configs):
@@ -224,27 +344,158 @@ class CrewManager:
         if agent_idx is None:
             raise ValueError(f"Agent not found: {config.agent_name}")
         
-        task = Task(
-            description=config.description,
-            expected_output=config.expected_output,
-            agent=self.agents[agent_idx]
-        )
+        with tracing.span("crew.add_task", agent=config.agent_name, task_number=len(self.tasks) + 1):
+            task = Task(
+                description=config.description,
+                expected_output=config.expected_output,
+                agent=self.agents[agent_idx],
+                callback=self._task_callback(len(self.tasks))
+            )
         
         self.tasks.append(task)
         self.task_configs.append(config)
         
         self.callback.log("task_added", {
             "task": config.description[:50],
-            "agent": config.agent_name,
-            "message": f"Görev eklendi: {config.description[:50]}..."
+            "agent": config.agent_name
         })
         
         return task
     
-    async def run(self, topic: str = "") -> str:
-        """Run the crew with the given topic"""
+    def _task_callback(self, index: int) -> Callable:
+        """Record when task ``index`` finishes and report it"""
+        def on_task_done(output):
+            now = time.perf_counter()
+            times = self._task_times.setdefault(index, [None, None])
+            if times[0] is None:
+                # Sequential mode: the task started when the previous one ended
+                ends = [t[1] for t in self._task_times.values() if t[1] is not None]
+                times[0] = max(ends, default=self._run_started)
+                if index + 1 < len(self.task_configs):
+                    _active_agent.set((self.callback, self.task_configs[index + 1].agent_name))
+            times[1] = now
+            
+            config = self.task_configs[index]
+            self.callback.log("task_completed", {
+                "agent": config.agent_name,
+                "task_number": index + 1,
+                "total_tasks": len(self.tasks),
+                "duration": round(now - times[0], 3),
+                "output": str(output)[:500]
+            })
+            self.callback.task_output(index, config.agent_name, str(output))
+            # Sequential crews run in one kickoff; stop between its tasks
+            check_cancelled()
+        return on_task_done
+    
+    def _execute_task(self, index: int, dependencies: List[int], topic: str, shared_agents: Counter,
+                      parent_span: Optional[tracing.Span] = None):
+        """Run one task as its own single-task crew, fed by its dependencies' outputs"""
+        from crewai import Crew, Process
+        
+        task = self.tasks[index]
+        config = self.task_configs[index]
+        task.context = [self.tasks[j] for j in dependencies]
+        if shared_agents[config.agent_name] > 1:
+            # Agents keep per-run executor state; don't share one between threads
+            task.agent = task.agent.copy()
+        
+        current_token.set(self._cancel_token)
+        check_cancelled()
+        _active_agent.set((self.callback, config.agent_name))
+        self.callback.agent_started(config.agent_name, task.description[:100])
+        self.callback.log("task_executing", {
+            "agent": config.agent_name,
+            "task_number": index + 1,
+            "total_tasks": len(self.tasks)
+        })
+        
+        self._task_times[index] = [time.perf_counter(), None]
+        with tracing.span("crew.task", parent=parent_span, task_number=index + 1, agent=config.agent_name):
+            Crew(
+                agents=[task.agent],
+                tasks=[task],
+                verbose=True,
+                process=Process.sequential
+            ).kickoff(inputs={'topic': topic})
+        self.callback.agent_completed(config.agent_name, "Görev tamamlandı")
+    
+    def _execute_graph(self, dependencies: List[List[int]], topic: str):
+        """Run tasks as soon as their dependencies are done"""
+        shared_agents = Counter(c.agent_name for c in self.task_configs)
+        done = set(self._restored)
+        pending = set(range(len(self.tasks))) - done
+        running = {}
+        parent_span = tracing.current_span()
+        
+        with ThreadPoolExecutor(max_workers=CREW_MAX_PARALLEL_TASKS, thread_name_prefix="crew-task") as pool:
+            while pending or running:
+                check_cancelled()
+                for i in sorted(pending):
+                    if all(j in done for j in dependencies[i]):
+                        pending.discard(i)
+                        future = pool.submit(
+                            self._execute_task, i, dependencies[i], topic, shared_agents, parent_span
+                        )
+                        running[future] = i
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    future.result()  # re-raise task errors
+                    done.add(i)
+    
+    def _timing_report(self, dependencies: List[List[int]], parallel: bool) -> dict:
+        durations = {
+            i: end - start for i, (start, end) in self._task_times.items()
+            if start is not None and end is not None
+        }
+        path, path_time = critical_path(dependencies, durations)
+        
+        def describe(i: int) -> dict:
+            start = self._task_times.get(i, [None])[0]
+            return {
+                "task_number": i + 1,
+                "agent": self.task_configs[i].agent_name,
+                "depends_on": [j + 1 for j in dependencies[i]],
+                "started_after": round(start - self._run_started, 3) if start is not None else None,
+                "duration": round(durations[i], 3) if i in durations else None
+            }
+        
+        return {
+            "mode": "parallel" if parallel else "sequential",
+            "wall_time": round(time.perf_counter() - self._run_started, 3),
+            "critical_path": [describe(i) for i in path],
+            "critical_path_time": round(path_time, 3),
+            "tasks": [describe(i) for i in range(len(self.tasks))]
+        }
+    
+    async def run(self, topic: str = "", executor: Optional[Executor] = None,
+                  output_file: Optional[str] = None, cancel_token: Optional[CancelToken] = None,
+                  restored: Optional[Dict[int, str]] = None) -> str:
+        """Run the crew with the given topic on ``executor`` (default pool if None).
+        
+        ``cancel_token`` is checked before every task, tool call and LLM call;
+        once it is cancelled or past its deadline the run raises CrewCancelled.
+        ``restored`` maps task indices to outputs of an earlier run (see
+        ``CrewCallback.task_output``); those tasks are skipped and their
+        outputs are handed to the tasks that depend on them.
+        """
         if not self.agents or not self.tasks:
             raise ValueError("No agents or tasks defined")
+        from crewai import Crew, Process
+        from crewai.tasks.task_output import TaskOutput
+        self._cancel_token = cancel_token
+        self._restored = {i: output for i, output in (restored or {}).items() if 0 <= i < len(self.tasks)}
+        for i, output in self._restored.items():
+            # Handed on as task context, which kickoff() never interpolates: outputs may contain braces
+            self.tasks[i].output = TaskOutput(
+                description=self.tasks[i].description, raw=output, agent=self.task_configs[i].agent_name
+            )
+        
+        dependencies = resolve_dependencies([c.depends_on for c in self.task_configs])
+        # Only crews that declare dependencies (or resume) leave the plain sequential process
+        parallel = bool(self._restored) or any(c.depends_on is not None for c in self.task_configs)
         
         # Update task descriptions with topic
         for task in self.tasks:
@@ -253,7 +504,7 @@ class CrewManager:
         
         # Set output file for the last task
         if self.tasks:
-            self.tasks[-1].output_file = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            self.tasks[-1].output_file = output_file or f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
         
         crew = Crew(
             agents=self.agents,
@@ -265,17 +516,43 @@ class CrewManager:
         self.callback.log("crew_running", {
             "agents_count": len(self.agents),
             "tasks_count": len(self.tasks),
-            "topic": topic,
-            "message": "🚀 Ekip çalışmaya başladı!"
+            "topic": topic
         })
+        for i in sorted(self._restored):
+            self.callback.log("task_restored", {
+                "agent": self.task_configs[i].agent_name,
+                "task_number": i + 1,
+                "total_tasks": len(self.tasks)
+            })
         
         # Run in thread pool to not block
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        
+        # Executor threads don't inherit the caller's context, so the span is passed on
+        parent_span = tracing.current_span()
         
         def execute_crew():
-            import sys
-            import io
-            from contextlib import redirect_stdout
+            with tracing.span("crew.kickoff", parent=parent_span, mode="parallel" if parallel else "sequential"):
+                return run_tasks()
+        
+        def run_tasks():
+            self._task_times = {}
+            self._run_started = time.perf_counter()
+            current_token.set(cancel_token)
+            check_cancelled()
+            _active_agent.set((self.callback, self.task_configs[0].agent_name))
+            
+            last = len(self.tasks) - 1
+            if len(self._restored) == len(self.tasks):
+                return self._restored[last]
+            
+            if parallel:
+                try:
+                    self._execute_graph(dependencies, topic)
+                    return self._restored[last] if last in self._restored else str(self.tasks[-1].output)
+                except Exception as e:
+                    self.callback.log("execution_error", {"error": str(e)})
+                    raise
             
             # Track agent activities by monitoring each task
             for i, (task, task_config) in enumerate(zip(self.tasks, self.task_configs)):
@@ -290,8 +567,7 @@ class CrewManager:
                 self.callback.log("task_executing", {
                     "agent": agent_config.name,
                     "task_number": i + 1,
-                    "total_tasks": len(self.tasks),
-                    "message": f"📝 Görev {i+1}/{len(self.tasks)} çalıştırılıyor..."
+                    "total_tasks": len(self.tasks)
                 })
             
             # Actually run the crew
@@ -304,28 +580,29 @@ class CrewManager:
                     
                 return str(result)
             except Exception as e:
-                self.callback.log("execution_error", {
-                    "message": f"❌ Çalıştırma hatası: {str(e)}"
-                })
+                self.callback.log("execution_error", {"error": str(e)})
                 raise
         
         try:
-            result = await loop.run_in_executor(None, execute_crew)
+            result = await loop.run_in_executor(executor, execute_crew)
+            
+            timing = self._timing_report(dependencies, parallel)
+            self.callback.log("crew_timing", {
+                "timing": timing
+            })
             
             self.callback.log("crew_completed", {
-                "result_length": len(result),
-                "message": "✅ Tüm görevler tamamlandı!"
+                "result_length": len(result)
             })
             
             return result
             
         except Exception as e:
             self.callback.log("crew_error", {
-                "error": str(e),
-                "message": f"❌ Hata: {str(e)}"
+                "error": str(e)
             })
             raise
     
     def get_logs(self) -> List[dict]:
         """Get all execution logs"""
-        return self.callback.logs
+        return self.callback.logs.records()
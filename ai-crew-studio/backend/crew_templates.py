@@ -0,0 +1,215 @@
+"""
+Crew Templates - Sunucuda tanımlı, doğrulanmış ve önceden hazırlanmış ekip şablonları
+"""
+
+import os
+import re
+import glob
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from crew_manager import TOOL_NAMES, AgentConfig, TaskConfig
+from task_graph import resolve_dependencies
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def render(text: str, variables: Dict[str, str]) -> str:
+    """Fill ``variables`` into ``text``.
+
+    Only ``{name}`` placeholders of known variables are replaced; others such
+    as ``{topic}``, literal braces (JSON examples) and ``{}`` are kept as is.
+    """
+    if not variables:
+        return text
+    return _PLACEHOLDER.sub(lambda m: str(variables.get(m.group(1), m.group(0))), text)
+
+
+@dataclass
+class CrewTemplate:
+    name: str
+    title: str
+    description: str
+    agents: List[AgentConfig]
+    tasks: List[TaskConfig]
+    model: str = "gemini-2.0-flash-lite"
+    # Filled into every prompt once, when the template is registered
+    variables: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CrewTemplate":
+        return cls(
+            name=data["name"],
+            title=data.get("title", data["name"]),
+            description=data.get("description", ""),
+            agents=[AgentConfig(**agent) for agent in data["agents"]],
+            tasks=[TaskConfig(**task) for task in data["tasks"]],
+            model=data.get("model", "gemini-2.0-flash-lite"),
+            variables=dict(data.get("variables", {}))
+        )
+
+
+class CompiledTemplate:
+    """A template checked once and kept as the agent/task dicts a session stores.
+
+    Tool names are checked against the tools crews can use, tasks against the
+    agents and their dependencies for cycles, and the prompts are rendered
+    with the template variables; only ``{topic}`` may be left for the run,
+    any other ``{name}`` (e.g. a misspelt variable) is rejected.
+    Applying it to a session copies these dicts.
+    """
+
+    def __init__(self, template: CrewTemplate):
+        if not template.agents or not template.tasks:
+            raise ValueError(f"Template {template.name!r} needs at least one agent and one task")
+        names = [agent.name for agent in template.agents]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Template {template.name!r} has duplicate agent names")
+        for agent in template.agents:
+            unknown = [tool for tool in agent.tools if tool not in TOOL_NAMES]
+            if unknown:
+                raise ValueError(f"Template {template.name!r}: agent {agent.name!r} has unknown tools {unknown}")
+        for i, task in enumerate(template.tasks, 1):
+            if task.agent_name not in names:
+                raise ValueError(f"Template {template.name!r}: task {i} uses unknown agent {task.agent_name!r}")
+        self.dependencies = resolve_dependencies([task.depends_on for task in template.tasks])
+
+        variables = template.variables
+        self.template = template
+        self.agents: Tuple[dict, ...] = tuple({
+            "name": agent.name,
+            "role": render(agent.role, variables),
+            "goal": render(agent.goal, variables),
+            "backstory": render(agent.backstory, variables),
+            "tools": list(agent.tools)
+        } for agent in template.agents)
+        self.tasks: Tuple[dict, ...] = tuple({
+            "description": render(task.description, variables),
+            "expected_output": render(task.expected_output, variables),
+            "agent_name": task.agent_name,
+            "depends_on": list(task.depends_on) if task.depends_on is not None else None
+        } for task in template.tasks)
+
+        prompts = [agent[key] for agent in self.agents for key in ("role", "goal", "backstory")]
+        prompts += [task[key] for task in self.tasks for key in ("description", "expected_output")]
+        unknown = sorted({name for text in prompts for name in _PLACEHOLDER.findall(text)} - {"topic"})
+        if unknown:
+            raise ValueError(f"Template {template.name!r} has unknown placeholders {unknown}")
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    def session_fields(self) -> dict:
+        """Fresh copies of the agents and tasks for one session"""
+        return {
+            "agents": [{**agent, "tools": list(agent["tools"])} for agent in self.agents],
+            "tasks": [
+                {**task, "depends_on": list(task["depends_on"]) if task["depends_on"] is not None else None}
+                for task in self.tasks
+            ]
+        }
+
+    def summary(self) -> dict:
+        return {
+            "name": self.template.name,
+            "title": self.template.title,
+            "description": self.template.description,
+            "model": self.template.model,
+            "agents": [agent["name"] for agent in self.agents],
+            "tasks_count": len(self.tasks)
+        }
+
+    def to_dict(self) -> dict:
+        return {**self.summary(), **self.session_fields(), "dependencies": self.dependencies}
+
+
+class TemplateRegistry:
+    """Named crew templates, compiled when registered"""
+
+    def __init__(self, templates: Iterable[CrewTemplate] = ()):
+        self._templates: Dict[str, CompiledTemplate] = {}
+        for template in templates:
+            self.register(template)
+
+    def register(self, template: CrewTemplate) -> CompiledTemplate:
+        compiled = CompiledTemplate(template)
+        self._templates[template.name] = compiled
+        return compiled
+
+    def load_dir(self, directory: str) -> int:
+        """Register every valid ``*.json`` template in ``directory``; returns how many.
+
+        Invalid files are logged and skipped so one bad template never stops
+        the server from starting.
+        """
+        loaded = 0
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.register(CrewTemplate.from_dict(json.load(f)))
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("Skipping invalid crew template %s: %s", path, e)
+                continue
+            loaded += 1
+        return loaded
+
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        return self._templates.get(name)
+
+    def list(self) -> List[dict]:
+        return [compiled.summary() for compiled in self._templates.values()]
+
+
+# The researcher → writer → editor crew of the protone prototype
+BLOG_TEAM = CrewTemplate(
+    name="blog_team",
+    title="Blog Yazı Ekibi",
+    description="Araştırmacı konuyu araştırır, yazar blog yazısını yazar, editör son halini verir.",
+    agents=[
+        AgentConfig(
+            name="Araştırmacı",
+            role="Kıdemli Teknoloji Araştırmacısı",
+            goal="Konu hakkında internetteki en güncel gelişmeleri bulmak",
+            backstory="Teknoloji trendlerini takip eden deneyimli bir araştırmacısın. "
+                      "İnterneti tarayıp en doğru bilgiyi bulursun.",
+            tools=["internet_search"]
+        ),
+        AgentConfig(
+            name="Yazar",
+            role="Teknoloji Blog Yazarı",
+            goal="Araştırma verilerini kullanarak {language} blog yazısı yazmak",
+            backstory="Karmaşık teknik konuları basit bir dile çevirirsin. Akıcı ve anlaşılır yazılar yazarsın."
+        ),
+        AgentConfig(
+            name="Editör",
+            role="Baş Editör",
+            goal="Yazıyı dilbilgisi ve yapısal olarak mükemmelleştirmek",
+            backstory="Yazının {language} imla kurallarına uygunluğunu kontrol edersin. Profesyonel editörsün."
+        ),
+    ],
+    tasks=[
+        TaskConfig(
+            description="'{topic}' konusu hakkında {period} yıllarındaki trendleri araştır.",
+            expected_output="Önemli noktaların bulunduğu özet rapor.",
+            agent_name="Araştırmacı"
+        ),
+        TaskConfig(
+            description="Araştırma raporunu kullanarak '{topic}' hakkında blog yazısı yaz. {language} olsun.",
+            expected_output="Markdown formatında blog yazısı.",
+            agent_name="Yazar"
+        ),
+        TaskConfig(
+            description="Yazıyı kontrol et. Sonuna 'Yazar: {signature}' ekle.",
+            expected_output="Final blog yazısı.",
+            agent_name="Editör"
+        ),
+    ],
+    variables={"language": "Türkçe", "period": "2024-2025", "signature": "AI Team"}
+)
+
+BUILTIN_TEMPLATES = (BLOG_TEAM,)
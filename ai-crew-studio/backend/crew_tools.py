@@ -0,0 +1,125 @@
+"""
+Crew Tools - Ajan araçları ve LLM token akışı (CrewAI/LangChain gerektirir)
+
+Imported by crew_manager on the first crew run so the server starts without
+loading CrewAI and LangChain.
+"""
+
+import time
+from typing import Any, Dict
+
+from crewai.tools import BaseTool
+from langchain_core.callbacks import BaseCallbackHandler
+
+from cancellation import check_cancelled
+from crew_manager import CrewCallback, _report_tool_call, page_fetcher, search_client
+from web_fetch import extract_text
+import tracing
+
+class InternetSearchTool(BaseTool):
+    """DuckDuckGo internet search tool"""
+    name: str = "Internet Search"
+    description: str = "İnternette güncel konuları aramak için kullanılır. Query parametresi ile arama terimi al."
+
+    def _run(self, query: str) -> str:
+        check_cancelled()
+        started = time.perf_counter()
+        try:
+            with tracing.span("tool.internet_search", query=query):
+                results, cached = search_client.lookup(query, max_results=3)
+            _report_tool_call("internet_search", started, cached)
+            
+            if not results:
+                return "Arama sonucu bulunamadı. Lütfen farklı anahtar kelimeler deneyin."
+            
+            # Format results nicely
+            formatted = []
+            for i, r in enumerate(results, 1):
+                formatted.append(f"{i}. {r.get('title', 'No title')}\n{r.get('body', 'No description')[:200]}...\nURL: {r.get('href', '')}")
+            
+            return "\n\n".join(formatted)
+        except Exception as e:
+            _report_tool_call("internet_search", started, error=str(e))
+            return f"Arama sırasında hata oluştu: {str(e)}. Farklı bir arama terimi deneyin."
+
+class WebScraperTool(BaseTool):
+    """Simple web scraper tool"""
+    name: str = "Web Scraper"
+    description: str = "Web sayfalarından içerik çekmek için kullanılır."
+
+    def _run(self, url: str) -> str:
+        check_cancelled()
+        started = time.perf_counter()
+        try:
+            with tracing.span("tool.web_scraper", url=url) as span:
+                html, source = page_fetcher.fetch_with_source(url)
+                if span:
+                    span.set_attribute("source", source)
+            _report_tool_call("web_scraper", started, cached=source != "network")
+            return extract_text(html, max_chars=3000)  # Limit to 3000 chars
+        except Exception as e:
+            _report_tool_call("web_scraper", started, error=str(e))
+            return f"Scraping hatası: {str(e)}"
+
+# Tool registry
+TOOL_REGISTRY = {
+    "internet_search": InternetSearchTool(),
+    "web_scraper": WebScraperTool(),
+}
+
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """Forwards one agent's streamed LLM output to the crew callback"""
+    
+    def __init__(self, callback: CrewCallback, agent_name: str):
+        self.callback = callback
+        self.agent_name = agent_name
+        # run_id -> (perf_counter start, wall clock start, enclosing span)
+        self._started: Dict[Any, tuple] = {}
+    
+    def _start(self, run_id):
+        self._started[run_id] = (time.perf_counter(), time.time(), tracing.current_span())
+    
+    def on_chat_model_start(self, serialized, messages, *, run_id=None, **kwargs):
+        self._start(run_id)
+    
+    def on_llm_start(self, serialized, prompts, *, run_id=None, **kwargs):
+        self._start(run_id)
+    
+    def on_llm_error(self, error, *, run_id=None, **kwargs):
+        self._started.pop(run_id, None)
+    
+    def on_llm_new_token(self, token: str, **kwargs):
+        if token:
+            self.callback.agent_token(self.agent_name, token)
+    
+    def on_rate_limited(self, wait_seconds: float, attempt: int = 0, error=None):
+        self.callback.rate_limited(self.agent_name, wait_seconds, attempt)
+    
+    def on_llm_end(self, response, *, run_id=None, **kwargs):
+        started = self._started.pop(run_id, None)
+        try:
+            generation = response.generations[0][0]
+        except (AttributeError, IndexError):
+            return
+        
+        if started is not None:
+            perf_started, wall_started, parent = started
+            cached = bool((generation.generation_info or {}).get("cached"))
+            # Cache hits cost no tokens
+            usage = {} if cached else getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            self.callback.llm_call(
+                self.agent_name,
+                time.perf_counter() - perf_started,
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                cached=cached
+            )
+            tracing.record(
+                "llm.call", wall_started, parent=parent,
+                agent=self.agent_name, cached=cached,
+                prompt_tokens=usage.get("input_tokens", 0),
+                completion_tokens=usage.get("output_tokens", 0)
+            )
+        if generation.text:
+            self.callback.agent_thinking(self.agent_name, generation.text)
@@ -0,0 +1,108 @@
+"""
+Crew Worker - Ekipleri ayrı süreçlerde çalıştırma
+"""
+
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from cancellation import CancelToken
+from crew_manager import CrewManager, AgentConfig, TaskConfig
+
+_SENTINEL = None
+_sync_manager = None
+
+
+def _manager():
+    global _sync_manager
+    if _sync_manager is None:
+        # spawn like the crew pool: forking the threaded server process can deadlock
+        _sync_manager = multiprocessing.get_context("spawn").Manager()
+    return _sync_manager
+
+
+def _event_queue():
+    """Queue proxy that can be passed to pool workers"""
+    return _manager().Queue()
+
+
+def cancel_event():
+    """Event proxy for a CancelToken whose crew runs in a pool worker"""
+    return _manager().Event()
+
+
+def shutdown():
+    """Stop the queue manager process"""
+    global _sync_manager
+    if _sync_manager is not None:
+        _sync_manager.shutdown()
+        _sync_manager = None
+
+
+def execute_in_process(model_name: str, api_key: Optional[str],
+                       agent_configs: List[AgentConfig], task_configs: List[TaskConfig],
+                       topic: str, events, use_cache: bool = True,
+                       cancelled=None, deadline: Optional[float] = None,
+                       restored: Optional[Dict[int, str]] = None) -> str:
+    """Build and run a crew inside a pool worker process.
+
+    Log events are put on ``events`` as they happen. ``cancelled`` (an event
+    proxy) and ``deadline`` rebuild the caller's CancelToken here. The API key
+    goes to this crew's LLM client only, so a reused worker never carries one
+    session's key into the next.
+    """
+    crew_manager = CrewManager(
+        model_name=model_name,
+        callback=events.put,
+        api_key=api_key,
+        use_cache=use_cache
+    )
+    for agent_config in agent_configs:
+        crew_manager.add_agent(agent_config)
+    for task_config in task_configs:
+        crew_manager.add_task(task_config)
+    token = CancelToken(deadline, cancelled) if cancelled is not None or deadline else None
+    return asyncio.run(crew_manager.run(topic, cancel_token=token, restored=restored))
+
+
+async def run_in_process(executor: Executor, model_name: str, api_key: Optional[str],
+                         agent_configs: List[AgentConfig], task_configs: List[TaskConfig],
+                         topic: str, callback: Optional[Callable] = None,
+                         use_cache: bool = True, cancel_token: Optional[CancelToken] = None,
+                         restored: Optional[Dict[int, str]] = None) -> str:
+    """Run a crew on a process pool, streaming its log events to ``callback``.
+
+    A ``cancel_token`` built with ``cancel_event()`` stops the worker at its
+    next checkpoint, which frees the pool process without killing it.
+    """
+    events = _event_queue()
+
+    def pump():
+        while True:
+            event = events.get()
+            if event is _SENTINEL:
+                break
+            if callback:
+                try:
+                    callback(event)
+                except Exception:
+                    pass
+
+    pump_thread = threading.Thread(target=pump, name="crew-events", daemon=True)
+    pump_thread.start()
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            executor, execute_in_process,
+            model_name, api_key, agent_configs, task_configs, topic, events, use_cache,
+            cancel_token.event if cancel_token else None,
+            cancel_token.deadline if cancel_token else None,
+            restored
+        )
+    finally:
+        # Events put by the worker precede its result, so this is always last
+        events.put(_SENTINEL)
+        await asyncio.to_thread(pump_thread.join)
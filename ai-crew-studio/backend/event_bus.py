@@ -0,0 +1,208 @@
+"""
+Event Bus - WebSocket mesajlarının worker'lar arasında dağıtımı
+
+Kullanım (ayrı makinelerde çalışan worker'lar için bağımsız broker):
+    python event_bus.py tcp://0.0.0.0:7070
+"""
+
+import os
+import sys
+import json
+import fcntl
+import asyncio
+from typing import Awaitable, Callable, Optional, Set
+from urllib.parse import urlparse
+
+Handler = Callable[[dict], Awaitable]
+
+# Upper bound for one JSON line; results can be large
+_LINE_LIMIT = 16 * 1024 * 1024
+_RECONNECT_DELAY = 1.0
+
+
+class EventBus:
+    """Delivers published envelopes to the handler of every subscribed worker"""
+
+    async def start(self, handler: Handler):
+        raise NotImplementedError
+
+    async def publish(self, envelope: dict):
+        raise NotImplementedError
+
+    async def stop(self):
+        pass
+
+
+class InProcessEventBus(EventBus):
+    """Single-process bus: publish calls the local handler directly"""
+
+    def __init__(self):
+        self._handler: Optional[Handler] = None
+
+    async def start(self, handler):
+        self._handler = handler
+
+    async def publish(self, envelope):
+        if self._handler:
+            await self._handler(envelope)
+
+
+class _Broker:
+    """Relays every line received from a client to all connected clients"""
+
+    def __init__(self):
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, address: tuple):
+        kind, target = address
+        if kind == "unix":
+            self.server = await asyncio.start_unix_server(self._serve, path=target, limit=_LINE_LIMIT)
+        else:
+            host, port = target
+            self.server = await asyncio.start_server(self._serve, host, port, limit=_LINE_LIMIT)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients.add(writer)
+        try:
+            while line := await reader.readline():
+                for client in list(self.clients):
+                    try:
+                        client.write(line)
+                    except Exception:
+                        self.clients.discard(client)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            for client in list(self.clients):
+                client.close()
+            await self.server.wait_closed()
+
+
+class SocketEventBus(EventBus):
+    """Cross-process bus over a Unix or TCP socket broker.
+
+    ``unix:///path/bus.sock``: workers on one host elect a broker among
+    themselves with a lock file next to the socket; if the broker worker
+    exits another one takes over on reconnect.
+    ``tcp://host:port``: workers only connect; run the broker separately with
+    ``python event_bus.py tcp://0.0.0.0:port``.
+    """
+
+    def __init__(self, url: str):
+        self.address = parse_address(url)
+        self._handler: Optional[Handler] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._broker: Optional[_Broker] = None
+        self._lock_fd: Optional[int] = None
+
+    async def start(self, handler):
+        self._handler = handler
+        reader = await self._connect()
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def publish(self, envelope):
+        await self._connected.wait()
+        data = json.dumps(envelope, ensure_ascii=False).encode() + b"\n"
+        try:
+            self._writer.write(data)
+            await self._writer.drain()
+        except ConnectionError:
+            self._connected.clear()
+
+    async def stop(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+        if self._broker:
+            await self._broker.stop()
+            self._broker = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _connect(self) -> asyncio.StreamReader:
+        while True:
+            if self.address[0] == "unix":
+                await self._maybe_host_broker()
+            try:
+                reader, self._writer = await self._open()
+                self._connected.set()
+                return reader
+            except (ConnectionError, FileNotFoundError, OSError):
+                await asyncio.sleep(_RECONNECT_DELAY)
+
+    async def _open(self):
+        kind, target = self.address
+        if kind == "unix":
+            return await asyncio.open_unix_connection(target, limit=_LINE_LIMIT)
+        host, port = target
+        return await asyncio.open_connection(host, port, limit=_LINE_LIMIT)
+
+    async def _maybe_host_broker(self):
+        """Become the broker if no other worker holds the lock"""
+        if self._broker:
+            return
+        path = self.address[1]
+        fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return
+        self._lock_fd = fd
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a dead broker
+        self._broker = _Broker()
+        await self._broker.start(self.address)
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                line = await reader.readline()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                line = b""
+            if not line:
+                self._connected.clear()
+                reader = await self._connect()
+                continue
+            try:
+                await self._handler(json.loads(line))
+            except Exception:
+                pass
+
+
+def parse_address(url: str) -> tuple:
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return ("unix", parsed.path)
+    if parsed.scheme == "tcp":
+        return ("tcp", (parsed.hostname, parsed.port))
+    raise ValueError(f"Unsupported event bus URL: {url}")
+
+
+def create_event_bus(url: str = "memory") -> EventBus:
+    """Build the bus selected by ``EVENT_BUS``"""
+    if url == "memory":
+        return InProcessEventBus()
+    return SocketEventBus(url)
+
+
+async def _serve_forever(url: str):
+    broker = _Broker()
+    await broker.start(parse_address(url))
+    print(f"📡 Event bus broker listening on {url}")
+    await broker.server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve_forever(sys.argv[1] if len(sys.argv) > 1 else "tcp://127.0.0.1:7070"))
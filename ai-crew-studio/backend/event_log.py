@@ -0,0 +1,249 @@
+"""
+Event Log - Olayların sınırlı ve sıkıştırılmış bellek kaydı (taşan olaylar diske yazılır)
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import weakref
+from collections import deque
+from datetime import datetime
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+# Newest events kept in memory per log; older ones go to the spill file
+EVENT_LOG_CAPACITY = int(os.environ.get("EVENT_LOG_CAPACITY", "1000"))
+# Directory for spill files; empty drops the oldest events instead
+EVENT_LOG_SPILL_DIR = os.environ.get("EVENT_LOG_SPILL_DIR", tempfile.gettempdir())
+
+# Short string fields that repeat in almost every event
+_INTERNED_FIELDS = ("from", "to", "tool", "topic")
+
+
+class EventType(IntEnum):
+    AGENT_ADDED = 1
+    TASK_ADDED = 2
+    AGENT_STARTED = 3
+    AGENT_THINKING = 4
+    AGENT_ACTION = 5
+    AGENT_COMPLETED = 6
+    AGENT_COMMUNICATION = 7
+    AGENT_TOKEN = 8
+    RATE_LIMITED = 9
+    LLM_CALL = 10
+    TOOL_CALL = 11
+    TASK_EXECUTING = 12
+    TASK_COMPLETED = 13
+    CREW_RUNNING = 14
+    CREW_TIMING = 15
+    CREW_COMPLETED = 16
+    CREW_ERROR = 17
+    EXECUTION_ERROR = 18
+    STEP_UPDATE = 19
+    AGENT_CREATED = 20
+    TASK_CREATED = 21
+    CREW_STARTED = 22
+    QUEUE_UPDATE = 23
+    MESSAGE = 24
+    ERROR = 25
+    BATCH_STARTED = 26
+    BATCH_COMPLETED = 27
+    TOPIC_STARTED = 28
+    TOPIC_COMPLETED = 29
+    TOPIC_FAILED = 30
+    CREW_CANCELLED = 31
+    TASK_RESTORED = 32
+
+    @property
+    def wire_name(self) -> str:
+        return self.name.lower()
+
+
+_TYPES_BY_NAME = {event_type.wire_name: event_type for event_type in EventType}
+
+
+def _rate_limited_message(agent, data: dict) -> str:
+    wait_seconds, attempt = data.get("wait_seconds", 0), data.get("attempt")
+    if attempt:
+        return f"⏳ {agent}: API kotası doldu, {wait_seconds:.1f} sn sonra tekrar denenecek ({attempt}. deneme)"
+    return f"⏳ {agent}: API kotası için {wait_seconds:.1f} sn beklendi"
+
+
+# Messages of these types are derived from the event fields when serialized
+MESSAGES: Dict[EventType, Callable[[Optional[str], dict], str]] = {
+    EventType.AGENT_ADDED: lambda agent, data: f"Ajan eklendi: {agent}",
+    EventType.TASK_ADDED: lambda agent, data: f"Görev eklendi: {data.get('task')}...",
+    EventType.AGENT_STARTED: lambda agent, data: f"🤖 {agent} göreve başladı",
+    EventType.AGENT_THINKING: lambda agent, data: f"💭 {agent} düşünüyor...",
+    EventType.AGENT_ACTION: lambda agent, data: f"⚡ {agent}: {data.get('action')}",
+    EventType.AGENT_COMPLETED: lambda agent, data: f"✅ {agent} görevini tamamladı",
+    EventType.AGENT_COMMUNICATION: lambda agent, data: f"💬 {data.get('from')} → {data.get('to')}",
+    EventType.RATE_LIMITED: _rate_limited_message,
+    EventType.TASK_EXECUTING: lambda agent, data: (
+        f"📝 Görev {data.get('task_number')}/{data.get('total_tasks')} çalıştırılıyor..."),
+    EventType.TASK_COMPLETED: lambda agent, data: (
+        f"✅ Görev {data.get('task_number')}/{data.get('total_tasks')} tamamlandı"),
+    EventType.TASK_RESTORED: lambda agent, data: (
+        f"♻️ Görev {data.get('task_number')}/{data.get('total_tasks')} önceki çalışmadan alındı"),
+    EventType.CREW_RUNNING: lambda agent, data: "🚀 Ekip çalışmaya başladı!",
+    EventType.CREW_TIMING: lambda agent, data: (
+        f"⏱️ Kritik yol: {data['timing'].get('critical_path_time')} sn / "
+        f"toplam {data['timing'].get('wall_time')} sn"),
+    EventType.CREW_COMPLETED: lambda agent, data: "✅ Tüm görevler tamamlandı!",
+    EventType.CREW_ERROR: lambda agent, data: f"❌ Hata: {data.get('error')}",
+    EventType.EXECUTION_ERROR: lambda agent, data: f"❌ Çalıştırma hatası: {data.get('error')}",
+}
+
+
+class EventRecord:
+    """One logged event, kept small until it is serialized.
+
+    The type is an ``EventType`` (unknown types stay as interned strings),
+    the timestamp a float, the agent name interned, and the ``message`` of
+    types listed in ``MESSAGES`` is only built by ``to_dict``.
+    """
+
+    __slots__ = ("type", "timestamp", "agent", "data", "seq")
+
+    def __init__(self, event_type: str, data: Optional[dict] = None, timestamp: Optional[float] = None,
+                 seq: Optional[int] = None):
+        self.type: Union[EventType, str] = _TYPES_BY_NAME.get(event_type) or sys.intern(event_type)
+        self.timestamp = timestamp
+        self.seq = seq
+        self.agent = None
+        data = dict(data) if data else {}
+        agent = data.get("agent")
+        if isinstance(agent, str):
+            self.agent = sys.intern(data.pop("agent"))
+        if self.type in MESSAGES:
+            data.pop("message", None)
+        for key in _INTERNED_FIELDS:
+            if isinstance(data.get(key), str):
+                data[key] = sys.intern(data[key])
+        self.data = data or None
+
+    @classmethod
+    def from_dict(cls, event: dict) -> "EventRecord":
+        data = dict(event)
+        event_type = data.pop("type", "") or ""
+        seq = data.pop("seq", None)
+        timestamp = data.pop("timestamp", None)
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp).timestamp()
+            except ValueError:
+                data["timestamp"] = timestamp
+                timestamp = None
+        return cls(event_type, data, timestamp, seq)
+
+    @property
+    def type_name(self) -> str:
+        return self.type.wire_name if isinstance(self.type, EventType) else self.type
+
+    def to_dict(self) -> dict:
+        event = {"type": self.type_name}
+        if self.timestamp is not None:
+            event["timestamp"] = datetime.fromtimestamp(self.timestamp).isoformat()
+        if self.agent is not None:
+            event["agent"] = self.agent
+        data = self.data or {}
+        event.update(data)
+        format_message = MESSAGES.get(self.type)
+        if format_message is not None:
+            event["message"] = format_message(self.agent, data)
+        if self.seq is not None:
+            event["seq"] = self.seq
+        return event
+
+
+def _remove_file(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class EventLog:
+    """Bounded, thread-safe event log.
+
+    The newest ``capacity`` records stay in memory. When it is full the
+    oldest records are written in a chunk to a JSON lines spill file in
+    ``spill_dir`` (deleted with the log); without a spill dir they are
+    dropped and counted. Reads return the spilled events first, so a log
+    always reads back in append order.
+    """
+
+    def __init__(self, capacity: int = EVENT_LOG_CAPACITY, spill_dir: Optional[str] = EVENT_LOG_SPILL_DIR):
+        self.capacity = max(1, capacity)
+        self.spill_dir = spill_dir or None
+        self.spilled = 0
+        self.dropped = 0
+        self._records: deque = deque()
+        self._lock = threading.Lock()
+        self._spill_path: Optional[str] = None
+        self._spilled_last_seq = 0
+        self._finalizer = None
+
+    def __len__(self):
+        return self.spilled + len(self._records)
+
+    def append(self, record: EventRecord):
+        with self._lock:
+            if len(self._records) >= self.capacity:
+                self._evict(max(1, self.capacity // 8))
+            self._records.append(record)
+
+    def _evict(self, count: int):
+        evicted = [self._records.popleft() for _ in range(min(count, len(self._records)))]
+        if self.spill_dir is None:
+            self.dropped += len(evicted)
+            return
+        try:
+            if self._spill_path is None:
+                fd, self._spill_path = tempfile.mkstemp(prefix="crew-events-", suffix=".jsonl", dir=self.spill_dir)
+                os.close(fd)
+                self._finalizer = weakref.finalize(self, _remove_file, self._spill_path)
+            lines = "".join(json.dumps(r.to_dict(), ensure_ascii=False, default=str) + "\n" for r in evicted)
+            with open(self._spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            self.dropped += len(evicted)
+            return
+        self.spilled += len(evicted)
+        self._spilled_last_seq = max(self._spilled_last_seq, evicted[-1].seq or 0)
+
+    def _read_spilled(self, since: int) -> Iterator[dict]:
+        if self._spill_path is None or (since and since >= self._spilled_last_seq):
+            return
+        try:
+            with open(self._spill_path, encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line)
+                    if event.get("seq", since + 1) > since:
+                        yield event
+        except OSError:
+            return
+
+    def records(self, since: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """Serialized events with ``seq`` greater than ``since``, oldest first"""
+        with self._lock:
+            memory = [r for r in self._records if r.seq is None or r.seq > since]
+            events = list(self._read_spilled(since))
+        if limit is not None:
+            memory = memory[:max(0, limit - len(events))]
+            events = events[:limit]
+        events.extend(r.to_dict() for r in memory)
+        return events
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self.spilled = self.dropped = self._spilled_last_seq = 0
+            if self._finalizer is not None:
+                self._finalizer()
+                self._finalizer = None
+            self._spill_path = None
+
+    close = clear
@@ -0,0 +1,147 @@
+"""
+Gemini LLM - Kota sınırlı ve yeniden denemeli Gemini istemcisi
+"""
+
+import time
+from typing import Iterator, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import Field
+
+from cancellation import check_cancelled
+from rate_limit import QuotaLimiter, backoff_delay, call_with_retry, get_quota_limiter, is_quota_error
+
+
+def _estimate_tokens(messages: List[BaseMessage]) -> int:
+    # About four characters per token; the real count is settled afterwards
+    return sum(len(str(message.content)) for message in messages) // 4 + 1
+
+
+def _total_tokens(message) -> int:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0) or 0)
+
+
+class RateLimitedGemini(ChatGoogleGenerativeAI):
+    """ChatGoogleGenerativeAI that shares one request/token quota per API key and model.
+
+    Every call first checks that its crew wasn't cancelled, then waits for
+    room in the quota. Quota errors are retried
+    with jittered exponential backoff; a streamed call is only retried if it
+    failed before its first chunk. Waits are reported to callbacks that
+    implement ``on_rate_limited(wait_seconds, attempt, error)``.
+    """
+
+    rpm: float = 15
+    tpm: float = 1_000_000
+    quota_retries: int = 5
+
+    def _limiter(self) -> QuotaLimiter:
+        api_key = self.google_api_key.get_secret_value() if self.google_api_key else ""
+        return get_quota_limiter(api_key, self.model, self.rpm, self.tpm)
+
+    def _notify(self, wait_seconds: float, attempt: int = 0, error: Optional[BaseException] = None):
+        handlers = self.callbacks if isinstance(self.callbacks, list) else []
+        for handler in handlers:
+            hook = getattr(handler, "on_rate_limited", None)
+            if hook:
+                try:
+                    hook(wait_seconds, attempt, error)
+                except Exception:
+                    pass
+
+    def _wait_for_quota(self, limiter: QuotaLimiter, estimate: int):
+        waited = limiter.acquire(estimate)
+        if waited:
+            self._notify(waited)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        limiter = self._limiter()
+        estimate = _estimate_tokens(messages)
+
+        def attempt() -> ChatResult:
+            check_cancelled()
+            self._wait_for_quota(limiter, estimate)
+            return super(RateLimitedGemini, self)._generate(messages, stop, run_manager, **kwargs)
+
+        result = call_with_retry(
+            attempt, limiter, self.quota_retries,
+            on_retry=lambda n, delay, error: self._notify(delay, n, error)
+        )
+        if result.generations:
+            limiter.settle(estimate, _total_tokens(result.generations[0].message))
+        return result
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        limiter = self._limiter()
+        estimate = _estimate_tokens(messages)
+        retries = 0
+        while True:
+            check_cancelled()
+            self._wait_for_quota(limiter, estimate)
+            started, used = False, 0
+            try:
+                for chunk in super()._stream(messages, stop, run_manager, **kwargs):
+                    started = True
+                    used = max(used, _total_tokens(chunk.message))
+                    yield chunk
+                limiter.settle(estimate, used)
+                return
+            except Exception as e:
+                if started or not is_quota_error(e) or retries >= self.quota_retries:
+                    raise
+                retries += 1
+                limiter.penalize()
+                limiter.note_retry()
+                delay = backoff_delay(retries)
+                self._notify(delay, retries, e)
+                time.sleep(delay)
+
+
+_MESSAGE_TYPES = {"system": SystemMessage, "assistant": AIMessage}
+
+
+def to_langchain_messages(messages: List[dict]) -> List[BaseMessage]:
+    """crewai's role/content dicts as LangChain messages; tool results go back as user turns"""
+    return [_MESSAGE_TYPES.get(m["role"], HumanMessage)(content=m["content"]) for m in messages]
+
+
+class CrewChatModel(BaseLLM):
+    """crewai LLM that sends every agent call through a LangChain chat model.
+
+    crewai 1.x only calls its own LLM classes, so the pooled
+    ``RateLimitedGemini`` (quota, retries, disk cache) and the callbacks set
+    on it (token streaming, ``llm_call`` accounting) are reached through this
+    adapter. Agents use the ReAct text format, so native function calling is
+    turned off and stop words are passed to the model.
+    """
+
+    llm_type: str = "langchain"
+    chat_model: BaseChatModel = Field(exclude=True)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None) -> str:
+        response = self.chat_model.invoke(
+            to_langchain_messages(self._format_messages(messages)),
+            stop=self.stop_sequences or None
+        )
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            self._track_token_usage_internal(dict(usage))
+        content = response.content
+        if isinstance(content, list):
+            content = "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+        # Cached replies were stored before any stop word was applied
+        return self._apply_stop_words(content)
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
@@ -0,0 +1,104 @@
+"""
+Import Benchmark - Modüllerin soğuk başlangıç (import) süresi ölçümü
+
+Imports each module in a fresh interpreter with ``python -X importtime``
+and reports the best time over a few runs, the slowest dependencies and
+whether a heavy package was loaded. Fails when ``main`` goes over the
+budget or imports CrewAI/LangChain/DuckDuckGo, which load on the first
+crew run.
+
+    python import_benchmark.py --runs 5 --budget-ms 1500
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Must not be imported by ``import main``
+HEAVY_PACKAGES = ("crewai", "langchain_core", "langchain_google_genai", "ddgs", "duckduckgo_search")
+
+
+def measure(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every package ``module`` loaded"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True,
+        # Keep the files main creates at import out of the working tree
+        env={**os.environ, "SESSION_STORE": "memory", "LLM_CACHE_ENABLED": "0", "PAGE_CACHE_DIR": "",
+             "RESULT_DIR": os.path.join(tempfile.gettempdir(), "crew-import-results")}
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    times: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return times
+
+
+def profile(module: str, runs: int, top: int) -> dict:
+    best: Optional[Dict[str, int]] = None
+    for _ in range(runs):
+        times = measure(module)
+        if best is None or times.get(module, 0) < best.get(module, 0):
+            best = times
+    best = best or {}
+    # Top-level packages only; their cumulative time includes submodules
+    packages = {name: us for name, us in best.items() if "." not in name and name != module}
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": round(best.get(module, 0) / 1000, 1),
+        "modules_loaded": len(best),
+        "heavy_loaded": [name for name in HEAVY_PACKAGES if name in best],
+        "slowest": [{"package": name, "ms": round(us / 1000, 1)} for name, us in slowest]
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="AI Crew Studio import time benchmark")
+    parser.add_argument("modules", nargs="*", default=["main", "crew_manager", "crew_tools"],
+                        help="Modules to import")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per module; the fastest is reported")
+    parser.add_argument("--top", type=int, default=8, help="Slowest packages to list")
+    parser.add_argument("--budget-ms", type=float, default=0, help="Limit for import main; 0 means none")
+    parser.add_argument("--json", help="Also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    args = parse_args(argv)
+    report = [profile(module, max(1, args.runs), args.top) for module in args.modules]
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    ok = True
+    for entry in report:
+        if entry["module"] != "main":
+            continue
+        if entry["heavy_loaded"]:
+            print(f"❌ main yüklenirken ağır paketler içe aktarıldı: {', '.join(entry['heavy_loaded'])}")
+            ok = False
+        if args.budget_ms and entry["import_ms"] > args.budget_ms:
+            print(f"❌ main içe aktarma süresi {entry['import_ms']} ms > {args.budget_ms} ms")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,82 @@
+"""
+Key Validator - Gemini API anahtarı doğrulama (önbellekli ve olay döngüsünü bloklamadan)
+"""
+
+import asyncio
+import hashlib
+from typing import Dict, Tuple
+
+import requests
+
+from caching import TTLCache
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+def _error_message(response: requests.Response) -> str:
+    try:
+        return response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {response.status_code}"
+
+
+class KeyValidator:
+    """Checks Gemini API keys and remembers the verdict per key hash.
+
+    A check is one metadata request for ``model``; it proves the key works
+    without spending tokens. Valid keys are remembered for ``valid_ttl``
+    seconds, rejected ones for ``invalid_ttl``; network and server errors are
+    not remembered. Concurrent checks of the same key share one request.
+    """
+
+    def __init__(self, model: str = "gemini-2.0-flash-lite", valid_ttl: float = 3600,
+                 invalid_ttl: float = 300, timeout: float = 10):
+        self.model = model
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._valid = TTLCache(valid_ttl, max_entries=1024)
+        self._invalid = TTLCache(invalid_ttl, max_entries=1024)
+        # key hash -> check in flight; callers on the event loop await the same one
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def check(self, api_key: str) -> Tuple[dict, bool]:
+        """Blocking check; returns the verdict and whether it may be cached"""
+        try:
+            response = self.session.get(
+                f"{GEMINI_API_URL}/models/{self.model}",
+                headers={"x-goog-api-key": api_key},
+                timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            return {"valid": False, "message": f"API anahtarı doğrulanamadı: {e}"}, False
+
+        if response.ok:
+            return {"valid": True, "message": "API anahtarı geçerli"}, True
+        if response.status_code == 429:
+            # Only a known key can run out of quota
+            return {"valid": True, "message": "API anahtarı geçerli (kota şu an dolu)"}, True
+        if response.status_code in (400, 401, 403):
+            return {"valid": False, "message": f"API anahtarı geçersiz: {_error_message(response)}"}, True
+        return {"valid": False, "message": f"API anahtarı doğrulanamadı: {_error_message(response)}"}, False
+
+    def _check_and_store(self, api_key: str, key_hash: str) -> dict:
+        verdict, cacheable = self.check(api_key)
+        if cacheable:
+            (self._valid if verdict["valid"] else self._invalid).set(key_hash, verdict)
+        return verdict
+
+    async def validate(self, api_key: str) -> dict:
+        """Verdict for ``api_key``; the request runs in a worker thread"""
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        verdict = self._valid.get(key_hash) or self._invalid.get(key_hash)
+        if verdict is not None:
+            return {**verdict, "cached": True}
+        check = self._inflight.get(key_hash)
+        if check is None:
+            check = self._inflight[key_hash] = asyncio.ensure_future(
+                asyncio.to_thread(self._check_and_store, api_key, key_hash)
+            )
+            check.add_done_callback(lambda _: self._inflight.pop(key_hash, None))
+        # A caller that goes away must not cancel the check the others wait for
+        verdict = await asyncio.shield(check)
+        return {**verdict, "cached": False}
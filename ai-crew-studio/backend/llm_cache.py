@@ -0,0 +1,204 @@
+"""
+LLM Cache - Tekrarlanan LLM çağrıları için disk önbelleği
+"""
+
+import re
+import time
+import hashlib
+import sqlite3
+import warnings
+import threading
+from typing import Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Hash of the model settings and the whitespace-normalized prompt.
+
+    ``llm_string`` is LangChain's serialization of the model parameters, so
+    model name and temperature are part of the key.
+    """
+    normalized = _WHITESPACE.sub(" ", prompt).strip()
+    return hashlib.sha256(f"{llm_string}\0{normalized}".encode()).hexdigest()
+
+
+class DiskLLMCache(BaseCache):
+    """Content-addressed LLM response cache in SQLite.
+
+    Entries expire after ``ttl_seconds``; when the stored values exceed
+    ``max_bytes`` the least recently used entries are evicted. Hit, miss and
+    eviction counters and the running size total live in the same file, so
+    they add up across worker processes.
+    """
+
+    # Expired entries are swept at most this often; lookups drop them anyway
+    PURGE_INTERVAL = 60.0
+    # Least recently used rows fetched per eviction round
+    EVICT_BATCH = 64
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at);
+        CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at);
+        CREATE TABLE IF NOT EXISTS llm_cache_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = "llm_cache.db", ttl_seconds: float = 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        # Seeds the size total for files written before it was tracked
+        self._conn.execute(
+            "INSERT OR IGNORE INTO llm_cache_stats (name, value) "
+            "SELECT 'bytes', COALESCE(SUM(size), 0) FROM llm_cache"
+        )
+        self._purged_at = 0.0
+
+    def _count(self, name: str, amount: int = 1):
+        self._conn.execute(
+            "INSERT INTO llm_cache_stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    self._delete([key])
+                    self._conn.execute("COMMIT")
+                self._count("misses")
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count("hits")
+        try:
+            # Values were written by update() below, so they are trusted
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                generations = loads(row[0])
+        except Exception:
+            return None
+        # Lets callbacks tell cache hits from real calls
+        for generation in generations:
+            generation.generation_info = {**(generation.generation_info or {}), "cached": True}
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        value = dumps(return_val)
+        now = time.time()
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            # One transaction, so the size total stays exact across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now)
+                )
+                self._count("bytes", len(value) - (old[0] if old else 0))
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _delete(self, keys) -> int:
+        """Delete entries by key and take their size off the running total"""
+        marks = ",".join("?" * len(keys))
+        freed = self._conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE key IN ({marks})", keys
+        ).fetchone()[0]
+        deleted = self._conn.execute(f"DELETE FROM llm_cache WHERE key IN ({marks})", keys).rowcount
+        self._count("bytes", -freed)
+        return deleted
+
+    def _evict(self, now: float):
+        evicted = 0
+        if now - self._purged_at >= self.PURGE_INTERVAL:
+            self._purged_at = now
+            cutoff = now - self.ttl_seconds
+            expired = [key for (key,) in self._conn.execute(
+                "SELECT key FROM llm_cache WHERE created_at < ?", (cutoff,)
+            )]
+            if expired:
+                evicted += self._delete(expired)
+
+        total = self._conn.execute("SELECT value FROM llm_cache_stats WHERE name = 'bytes'").fetchone()[0]
+        while total > self.max_bytes:
+            # Walks the accessed_at index only as far as needed
+            victims, freed = [], 0
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY accessed_at LIMIT ?", (self.EVICT_BATCH,)
+            ).fetchall():
+                victims.append(key)
+                freed += size
+                if total - freed <= self.max_bytes:
+                    break
+            if not victims:
+                break
+            evicted += self._delete(victims)
+            total -= freed
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.execute("UPDATE llm_cache_stats SET value = 0 WHERE name = 'bytes'")
+            self._conn.execute("COMMIT")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM llm_cache_stats").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        size = counters.get("bytes", 0)
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+
+
+_cache: Optional[DiskLLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache(path: str = "llm_cache.db", ttl_seconds: float = 24 * 3600,
+                  max_bytes: int = 256 * 1024 * 1024) -> DiskLLMCache:
+    """Process-wide cache instance, created on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskLLMCache(path, ttl_seconds, max_bytes)
+        return _cache
@@ -5,42 +5,360 @@ FastAPI ile CrewAI agent orchestration
 
 import os
 import json
+import time
 import asyncio
+import logging
+import weakref
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from typing import List, Optional, Dict, Awaitable, Callable
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-from crew_manager import CrewManager, AgentConfig, TaskConfig
+from crew_manager import CrewManager, AgentConfig, TaskConfig, llm_cache, llm_pool, page_fetcher, prewarm
+from crew_templates import BUILTIN_TEMPLATES, TemplateRegistry
+from event_bus import EventBus, create_event_bus
+from outbound import EPHEMERAL_TYPES, OutboundBuffer, build_frames, concatenate
+import metrics
+import tracing
+from batch import run_batch, topic_result_key
+from cancellation import CancelToken, CrewCancelled
+from crew_worker import cancel_event, run_in_process, shutdown as shutdown_crew_worker
+from key_validator import KeyValidator
+from rate_limit import quota_stats
+from result_files import ResultFiles, parse_range, split_text
+from scheduler import CrewScheduler, QueueFullError
+from session_stats import SessionStats
+from session_store import ACTIVE_STATUSES, SessionState, SessionStore, create_session_store
+from task_graph import resolve_dependencies
+
+logger = logging.getLogger(__name__)
+
+# Crew execution limits
+CREW_MAX_WORKERS = int(os.environ.get("CREW_MAX_WORKERS", "4"))
+CREW_MAX_QUEUE = int(os.environ.get("CREW_MAX_QUEUE", "32"))
+CREW_EXECUTOR = os.environ.get("CREW_EXECUTOR", "thread")  # "thread" | "process"
+BATCH_MAX_PARALLEL = int(os.environ.get("BATCH_MAX_PARALLEL", "2"))
+# Default run time limit of a crew in seconds; 0 means none. /start may pass "timeout"
+CREW_TIMEOUT_SECONDS = float(os.environ.get("CREW_TIMEOUT_SECONDS", "0"))
+# Load CrewAI/LangChain at startup (in the background) instead of on the first crew run
+CREW_PREWARM = os.environ.get("CREW_PREWARM", "0") == "1"
+
+# Directory of extra crew templates (*.json), added to the built-in ones
+CREW_TEMPLATES_DIR = os.environ.get("CREW_TEMPLATES_DIR", "")
+
+# Seconds a key validation verdict is reused: accepted keys / rejected keys
+KEY_VALIDATION_TTL = float(os.environ.get("KEY_VALIDATION_TTL", "3600"))
+KEY_INVALID_TTL = float(os.environ.get("KEY_INVALID_TTL", "300"))
+
+# Session persistence
+SESSION_STORE = os.environ.get("SESSION_STORE", "sqlite")  # "sqlite" | "memory"
+SESSION_DB_PATH = os.environ.get("SESSION_DB_PATH", "sessions.db")
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL_SECONDS", str(24 * 3600)))
+SESSION_EVICT_INTERVAL = float(os.environ.get("SESSION_EVICT_INTERVAL", "300"))
+# Workers heartbeat into the session store; a worker silent for three beats is
+# presumed dead and its queued/running sessions become interrupted (resumable)
+WORKER_ID = uuid.uuid4().hex
+WORKER_HEARTBEAT_SECONDS = float(os.environ.get("WORKER_HEARTBEAT_SECONDS", "10"))
+WORKER_DEAD_AFTER = 3 * WORKER_HEARTBEAT_SECONDS
+
+# Final results are kept as files; /result inlines only those up to this size
+RESULT_DIR = os.environ.get("RESULT_DIR", "results")
+RESULT_INLINE_MAX_BYTES = int(os.environ.get("RESULT_INLINE_MAX_BYTES", str(256 * 1024)))
+
+# WebSocket fan-out between workers: "memory", "unix:///tmp/crew-bus.sock" or "tcp://host:port"
+EVENT_BUS = os.environ.get("EVENT_BUS", "memory")
+
+# Session storage
+sessions = create_session_store(SESSION_STORE, SESSION_DB_PATH)
+results = ResultFiles(RESULT_DIR)
+templates = TemplateRegistry(BUILTIN_TEMPLATES)
+if CREW_TEMPLATES_DIR:
+    templates.load_dir(CREW_TEMPLATES_DIR)
+key_validator = KeyValidator(valid_ttl=KEY_VALIDATION_TTL, invalid_ttl=KEY_INVALID_TTL)
+
+# Stats of crews running in this worker; stored on the session when they finish
+live_stats: Dict[str, SessionStats] = {}
+
+# Cancellation tokens of the crews running in this worker
+cancel_tokens: Dict[str, CancelToken] = {}
 
 # WebSocket connection manager
+class _Client:
+    """A local WebSocket with its own outbound buffer and sender task"""
+    
+    def __init__(self, websocket: WebSocket, max_events: int):
+        self.websocket = websocket
+        self.buffer = OutboundBuffer(max_events)
+        self.ready = asyncio.Event()
+        self.sender: Optional[asyncio.Task] = None
+        # Replayed log events are sent before live ones; last_seq dedupes both.
+        # Only the sender task moves last_seq, back to replay_since for a replay
+        self.replay: List[dict] = []
+        self.replay_since: Optional[int] = None
+        self.last_seq = 0
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+    """Routes messages through the event bus to whichever worker holds the socket.
+    
+    Crew events are posted into a per-session batch and published every
+    ``flush_interval`` seconds. Every event of a batch is appended to
+    ``event_log`` before anything is coalesced or dropped, which gives it its
+    ``seq`` and lets reconnecting or lagging clients replay the gap. Each
+    local client is fed by its own sender task, so a slow client only fills
+    (and drops from) its own buffer. Envelopes with a ``control`` key carry
+    commands for every worker (e.g. cancel) to the registered handler.
+    """
+    
+    REPLAY_FRAME_SIZE = 200
+    
+    def __init__(self, bus: EventBus, event_log: SessionStore,
+                 flush_interval: float = 0.05, max_buffered: int = 500):
+        self.bus = bus
+        self.event_log = event_log
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.clients: Dict[str, _Client] = {}
+        self._pending: Dict[str, List[dict]] = {}
+        # One flush per session at a time, so events are published in seq order
+        self._send_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.control_handlers: Dict[str, Callable[[dict], Awaitable]] = {}
+    
+    async def start(self):
+        await self.bus.start(self.deliver)
+    
+    async def stop(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.flush()
+        for session_id in list(self.clients):
+            self.disconnect(session_id)
+        await self.bus.stop()
     
-    async def connect(self, websocket: WebSocket, session_id: str):
+    async def connect(self, websocket: WebSocket, session_id: str, since: Optional[int] = None):
         await websocket.accept()
-        self.active_connections[session_id] = websocket
+        self.disconnect(session_id)
+        client = _Client(websocket, self.max_buffered)
+        # Registered first so live events are buffered while the replay is read;
+        # they are only sent once the sender starts, after the replay
+        self.clients[session_id] = client
+        if since is not None:
+            await self._load_replay(session_id, client, since)
+        if self.clients.get(session_id) is client:
+            client.sender = asyncio.create_task(self._sender(session_id, client))
     
-    def disconnect(self, session_id: str):
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
+    async def replay(self, session_id: str, since: int):
+        """Resend logged events after ``since`` to the local client"""
+        client = self.clients.get(session_id)
+        if client is not None:
+            await self._load_replay(session_id, client, since)
     
-    async def send_message(self, session_id: str, message: dict):
-        if session_id in self.active_connections:
-            try:
-                await self.active_connections[session_id].send_json(message)
-            except:
-                self.disconnect(session_id)
+    async def _load_replay(self, session_id: str, client: _Client, since: int):
+        try:
+            events = await asyncio.to_thread(self.event_log.get_logs, session_id, since)
+        except Exception:
+            logger.exception("Event log read failed for %s", session_id)
+            return
+        client.replay = events
+        client.replay_since = since
+        client.ready.set()
+    
+    def disconnect(self, session_id: str, websocket: Optional[WebSocket] = None):
+        client = self.clients.get(session_id)
+        if client is None or (websocket is not None and client.websocket is not websocket):
+            return
+        del self.clients[session_id]
+        if client.sender is not None:
+            client.sender.cancel()
+    
+    def post(self, session_id: str, message: dict):
+        """Queue a message for the next batch; must run on the event loop thread"""
+        pending = self._pending.setdefault(session_id, [])
+        # Streamed tokens are joined (lossless); everything else is kept for the log
+        merged = concatenate(pending[-1], message) if pending else None
+        if merged is not None:
+            pending[-1] = merged
+        else:
+            pending.append(message)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_interval, self._schedule_flush)
+    
+    def _schedule_flush(self):
+        self._flush_handle = None
+        asyncio.create_task(self.flush())
+    
+    async def flush(self):
+        """Publish every pending batch"""
+        for session_id in list(self._pending):
+            await self.send_message(session_id)
+    
+    async def send_message(self, session_id: str, message: Optional[dict] = None):
+        lock = self._send_locks.get(session_id)
+        if lock is None:
+            lock = self._send_locks[session_id] = asyncio.Lock()
+        async with lock:
+            # Pending events go first so ordering is kept
+            events = self._pending.pop(session_id, [])
+            if message is not None:
+                events.append(message)
+            if events:
+                events = await self._log_events(session_id, events)
+                await self.bus.publish({"session_id": session_id, "events": events})
+    
+    async def _log_events(self, session_id: str, events: List[dict]) -> List[dict]:
+        # The store may block (SQLite waits up to its busy timeout); keep it off the loop
+        try:
+            logged = iter(await asyncio.to_thread(
+                self.event_log.append_events,
+                session_id, [e for e in events if e.get("type") not in EPHEMERAL_TYPES]
+            ))
+        except Exception:
+            logger.exception("Event log write failed for %s", session_id)
+            return events
+        return [e if e.get("type") in EPHEMERAL_TYPES else next(logged) for e in events]
     
     async def broadcast(self, message: dict):
-        for session_id in list(self.active_connections.keys()):
-            await self.send_message(session_id, message)
+        await self.bus.publish({"session_id": None, "events": [message]})
+    
+    async def control(self, command: str, session_id: str):
+        """Run ``command`` on every worker, this one included"""
+        await self.bus.publish({"session_id": session_id, "control": command})
+    
+    async def deliver(self, envelope: dict):
+        """Hand a bus envelope to the matching local clients without waiting on them"""
+        command = envelope.get("control")
+        if command is not None:
+            handler = self.control_handlers.get(command)
+            if handler:
+                try:
+                    await handler(envelope)
+                except Exception:
+                    logger.exception("Control command %s failed", command)
+            return
+        session_id = envelope.get("session_id")
+        targets = list(self.clients) if session_id is None else [session_id]
+        for target in targets:
+            client = self.clients.get(target)
+            if client:
+                client.buffer.extend(envelope["events"])
+                client.ready.set()
+    
+    async def _sender(self, session_id: str, client: _Client):
+        while True:
+            await client.ready.wait()
+            client.ready.clear()
+            frames = []
+            replay, client.replay = client.replay, []
+            if client.replay_since is not None:
+                client.last_seq, client.replay_since = client.replay_since, None
+            for i in range(0, len(replay), self.REPLAY_FRAME_SIZE):
+                frames.append((self._unseen(client, replay[i:i + self.REPLAY_FRAME_SIZE]), 0))
+            events, dropped, gap = client.buffer.drain()
+            if gap:
+                # Logged events were evicted from the full buffer; read them back
+                # from the log, then the rest of the buffer (deduped by seq)
+                try:
+                    missed = await asyncio.to_thread(self.event_log.get_logs, session_id, client.last_seq)
+                except Exception:
+                    self.disconnect(session_id, client.websocket)
+                    return
+                for i in range(0, len(missed), self.REPLAY_FRAME_SIZE):
+                    frames.append((self._unseen(client, missed[i:i + self.REPLAY_FRAME_SIZE]), 0))
+            frames.append((self._unseen(client, events), dropped))
+            try:
+                for events, dropped in frames:
+                    if events or dropped:
+                        started = time.perf_counter()
+                        with tracing.span("ws.send", trace_id=tracing.trace_id_for(session_id),
+                                          session_id=session_id, events=len(events)):
+                            for frame in build_frames(events, dropped):
+                                await client.websocket.send_json(frame)
+                        WS_SEND_SECONDS.observe(time.perf_counter() - started)
+                        WS_EVENTS_SENT.inc(len(events))
+                        WS_EVENTS_DROPPED.inc(dropped)
+            except Exception:
+                self.disconnect(session_id, client.websocket)
+                return
+    
+    @staticmethod
+    def _unseen(client: _Client, events: List[dict]) -> List[dict]:
+        """Drop events the client already has and advance its last_seq"""
+        unseen = []
+        for event in events:
+            seq = event.get("seq")
+            if seq is not None:
+                if seq <= client.last_seq:
+                    continue
+                client.last_seq = seq
+            unseen.append(event)
+        return unseen
 
-manager = ConnectionManager()
+manager = ConnectionManager(create_event_bus(EVENT_BUS), sessions)
+
+async def send_queue_position(session_id: str, position: int):
+    await manager.send_message(session_id, {
+        "type": "queue_update",
+        "position": position,
+        "message": f"⏳ Sırada bekleniyor: {position}. sıra"
+    })
+
+scheduler = CrewScheduler(
+    max_workers=CREW_MAX_WORKERS,
+    max_queue_size=CREW_MAX_QUEUE,
+    on_position=send_queue_position,
+    mode=CREW_EXECUTOR,
+    initializer=prewarm if CREW_PREWARM else None
+)
+
+# Metrics (served in Prometheus text format on /metrics)
+metrics.registry.gauge("crew_queue_depth", "Crews waiting for a worker", collect=lambda: scheduler.queue_depth)
+metrics.registry.gauge("crew_active", "Crews running now", collect=lambda: scheduler.active_count)
+metrics.registry.gauge(
+    "crew_executor_utilization", "Share of crew workers in use",
+    collect=lambda: scheduler.busy_slots / scheduler.max_workers
+)
+metrics.registry.gauge("ws_clients", "WebSocket clients connected to this worker", collect=lambda: len(manager.clients))
+
+def _quota_wait_by_model() -> Dict[tuple, float]:
+    # One limiter per API key and model; keys are summed so none is exposed
+    totals: Dict[tuple, float] = {}
+    for item in quota_stats():
+        totals[(item["model"],)] = totals.get((item["model"],), 0.0) + item["wait_seconds"]
+    return totals
+
+metrics.registry.counter(
+    "llm_quota_wait_seconds_total", "Time spent waiting for the shared LLM quota", ("model",),
+    collect=_quota_wait_by_model
+)
+CREW_RUNS = metrics.registry.counter("crew_runs_total", "Finished crew runs", ("status",))
+CREW_RUN_SECONDS = metrics.registry.histogram("crew_run_duration_seconds", "Crew run wall time")
+LLM_CALL_SECONDS = metrics.registry.histogram("llm_call_duration_seconds", "LLM call latency", ("cached",))
+LLM_TOKENS = metrics.registry.counter("llm_tokens_total", "LLM tokens used", ("kind",))
+TOOL_CALL_SECONDS = metrics.registry.histogram("tool_call_duration_seconds", "Agent tool call latency", ("tool",))
+TOOL_ERRORS = metrics.registry.counter("tool_errors_total", "Agent tool calls that failed", ("tool",))
+WS_SEND_SECONDS = metrics.registry.histogram("ws_send_duration_seconds", "Time to write one frame to a WebSocket")
+WS_EVENTS_SENT = metrics.registry.counter("ws_events_sent_total", "Events written to WebSockets")
+WS_EVENTS_DROPPED = metrics.registry.counter("ws_events_dropped_total", "Events dropped for slow WebSocket clients")
+
+def observe_event(event: dict):
+    """Feed LLM and tool accounting events into the metrics"""
+    event_type = event.get("type")
+    if event_type == "llm_call":
+        LLM_CALL_SECONDS.observe(event.get("duration", 0.0), cached=str(bool(event.get("cached"))).lower())
+        LLM_TOKENS.inc(event.get("prompt_tokens", 0), kind="prompt")
+        LLM_TOKENS.inc(event.get("completion_tokens", 0), kind="completion")
+    elif event_type == "tool_call":
+        TOOL_CALL_SECONDS.observe(event.get("duration", 0.0), tool=event.get("tool"))
+        if event.get("error"):
+            TOOL_ERRORS.inc(tool=event.get("tool"))
 
 # Pydantic Models
 class AgentCreate(BaseModel):
@@ -54,6 +372,8 @@ class TaskCreate(BaseModel):
     description: str
     expected_output: str
     agent_name: str
+    # Indices of the tasks this one needs; omitted means "the previous task"
+    depends_on: Optional[List[int]] = None
 
 class CrewConfig(BaseModel):
     agents: List[AgentCreate]
@@ -61,28 +381,83 @@ class CrewConfig(BaseModel):
     model: str = "gemini-2.0-flash-lite"
     topic: str = ""
 
-class SessionState(BaseModel):
-    id: str
-    status: str
-    agents: List[dict] = []
-    tasks: List[dict] = []
-    model: str = ""
-    api_key: str = ""
-    current_step: int = 0
-    logs: List[dict] = []
-    result: Optional[str] = None
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+class BatchConfig(CrewConfig):
+    topics: List[str]
+    api_key: Optional[str] = None
+    max_parallel: int = BATCH_MAX_PARALLEL
+    priority: int = 0
+    use_cache: bool = True
+    timeout: float = CREW_TIMEOUT_SECONDS
 
-# Session storage
-sessions: Dict[str, SessionState] = {}
+def get_session_or_404(session_id: str, **options) -> SessionState:
+    session = sessions.get(session_id, **options)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+async def evict_sessions_periodically():
+    while True:
+        await asyncio.sleep(SESSION_EVICT_INTERVAL)
+        try:
+            evicted = await asyncio.to_thread(sessions.evict_expired, SESSION_TTL_SECONDS)
+            if evicted:
+                print(f"🧹 {evicted} eski oturum temizlendi")
+            await asyncio.to_thread(results.evict_expired, SESSION_TTL_SECONDS)
+            await asyncio.to_thread(page_fetcher.evict_cache)
+            llm_pool.evict_idle()
+        except Exception:
+            logger.exception("Session eviction failed")
+
+async def report_interrupted(session_ids: List[str]):
+    for session_id in session_ids:
+        await manager.send_message(session_id, {
+            "type": "error",
+            "message": "⚠️ Sunucu yeniden başladı, çalışma yarıda kaldı. Devam ettirebilirsiniz.",
+            "timestamp": datetime.now().isoformat()
+        })
+
+async def heartbeat_periodically():
+    """Keep this worker's claims alive and release runs of workers that died"""
+    while True:
+        try:
+            await asyncio.to_thread(sessions.heartbeat, WORKER_ID)
+            orphans = await asyncio.to_thread(sessions.release_orphans, WORKER_DEAD_AFTER)
+            if orphans:
+                print(f"⚠️ {len(orphans)} yarım kalan çalışma kesildi olarak işaretlendi")
+                await report_interrupted(orphans)
+        except Exception:
+            logger.exception("Worker heartbeat failed")
+        await asyncio.sleep(WORKER_HEARTBEAT_SECONDS)
+
+async def prewarm_crew_stack():
+    try:
+        seconds = await asyncio.to_thread(prewarm)
+        print(f"🔥 Ekip bileşenleri önceden yüklendi ({seconds:.1f} sn)")
+    except Exception:
+        logger.exception("Crew prewarm failed")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 AI Crew Studio Backend Starting...")
+    await manager.start()
+    await scheduler.start()
+    heartbeat = asyncio.create_task(heartbeat_periodically())
+    evictor = asyncio.create_task(evict_sessions_periodically())
+    # Not awaited: requests are served while the crew stack loads
+    warmup = asyncio.create_task(prewarm_crew_stack()) if CREW_PREWARM else None
     yield
     # Shutdown
+    if warmup is not None:
+        warmup.cancel()
+    evictor.cancel()
+    heartbeat.cancel()
+    await scheduler.stop()
+    await manager.stop()
+    shutdown_crew_worker()
+    # Runs cut short by this shutdown can be resumed by any worker right away
+    sessions.retire(WORKER_ID)
+    sessions.close()
     print("👋 AI Crew Studio Backend Shutting Down...")
 
 app = FastAPI(
@@ -133,51 +508,43 @@ class ApiKeyRequest(BaseModel):
 
 @app.post("/api/settings/validate-key")
 async def validate_api_key(request: ApiKeyRequest):
-    """Validate Gemini API key by making a test request"""
-    import google.generativeai as genai
-    try:
-        genai.configure(api_key=request.api_key)
-        # Quick test to validate key
-        model = genai.GenerativeModel('gemini-2.0-flash-lite')
-        response = model.generate_content("Say 'OK'", generation_config={"max_output_tokens": 10})
-        return {"valid": True, "message": "API anahtarı geçerli"}
-    except Exception as e:
-        return {"valid": False, "message": f"API anahtarı geçersiz: {str(e)}"}
+    """Validate Gemini API key by making a test request (verdicts are cached per key hash)"""
+    return await key_validator.validate(request.api_key)
 
 @app.post("/api/sessions/{session_id}/api-key")
 async def set_api_key(session_id: str, request: ApiKeyRequest):
     """Set API key for a session"""
-    if session_id not in sessions:
+    if sessions.update(session_id, api_key=request.api_key) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    sessions[session_id].api_key = request.api_key
     return {"status": "success"}
 
 @app.post("/api/sessions")
 async def create_session():
     session_id = str(uuid.uuid4())
-    sessions[session_id] = SessionState(
+    sessions.create(SessionState(
         id=session_id,
         status="created",
         current_step=1
-    )
+    ))
     return {"session_id": session_id}
 
 @app.get("/api/sessions/{session_id}")
 async def get_session(session_id: str):
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    return sessions[session_id]
+    # logs/result are left out here; use /result for the full payload
+    return get_session_or_404(session_id)
 
 @app.post("/api/sessions/{session_id}/agents")
 async def add_agents(session_id: str, agents: List[AgentCreate]):
-    if session_id not in sessions:
+    session = sessions.update(
+        session_id,
+        agents=[agent.model_dump() for agent in agents],
+        current_step=2,
+        status="agents_defined"
+    )
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    sessions[session_id].agents = [agent.model_dump() for agent in agents]
-    sessions[session_id].current_step = 2
-    sessions[session_id].status = "agents_defined"
-    
     await manager.send_message(session_id, {
         "type": "step_update",
         "step": 2,
@@ -188,29 +555,40 @@ async def add_agents(session_id: str, agents: List[AgentCreate]):
 
 @app.post("/api/sessions/{session_id}/model")
 async def set_model(session_id: str, model: dict):
-    if session_id not in sessions:
+    session = sessions.update(
+        session_id,
+        model=model.get("model_id", "gemini-2.0-flash-lite"),
+        current_step=3,
+        status="model_selected"
+    )
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    sessions[session_id].model = model.get("model_id", "gemini-2.0-flash-lite")
-    sessions[session_id].current_step = 3
-    sessions[session_id].status = "model_selected"
-    
     await manager.send_message(session_id, {
         "type": "step_update",
         "step": 3,
-        "message": f"Model seçildi: {sessions[session_id].model}"
+        "message": f"Model seçildi: {session.model}"
     })
     
-    return {"status": "success", "model": sessions[session_id].model}
+    return {"status": "success", "model": session.model}
 
 @app.post("/api/sessions/{session_id}/tasks")
 async def add_tasks(session_id: str, tasks: List[TaskCreate]):
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    try:
+        resolve_dependencies([task.depends_on for task in tasks])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    sessions[session_id].tasks = [task.model_dump() for task in tasks]
-    sessions[session_id].current_step = 4
-    sessions[session_id].status = "tasks_defined"
+    session = sessions.update(
+        session_id,
+        tasks=[task.model_dump() for task in tasks],
+        current_step=4,
+        status="tasks_defined"
+    )
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # Checkpoints belong to the previous task list
+    sessions.clear_task_outputs(session_id)
     
     await manager.send_message(session_id, {
         "type": "step_update",
@@ -220,67 +598,243 @@ async def add_tasks(session_id: str, tasks: List[TaskCreate]):
     
     return {"status": "success", "tasks_count": len(tasks)}
 
-@app.post("/api/sessions/{session_id}/start")
-async def start_crew(session_id: str, config: dict):
-    if session_id not in sessions:
+@app.get("/api/templates")
+async def get_templates():
+    return {"templates": templates.list()}
+
+@app.get("/api/templates/{name}")
+async def get_template(name: str):
+    template = templates.get(name)
+    if template is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return template.to_dict()
+
+class TemplateApply(BaseModel):
+    template: str
+
+@app.post("/api/sessions/{session_id}/template")
+async def apply_template(session_id: str, request: TemplateApply):
+    """Set the agents and tasks of a session from a template (and its model if none is chosen)"""
+    template = templates.get(request.template)
+    if template is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+    session = get_session_or_404(session_id)
+    
+    session = sessions.update(
+        session_id,
+        **template.session_fields(),
+        model=session.model or template.template.model,
+        current_step=4,
+        status="tasks_defined"
+    )
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
+    sessions.clear_task_outputs(session_id)
     
-    session = sessions[session_id]
-    session.status = "running"
-    session.started_at = datetime.now().isoformat()
-    session.logs = []
+    await manager.send_message(session_id, {
+        "type": "step_update",
+        "step": 4,
+        "message": f"Şablon uygulandı: {template.template.title}"
+    })
+    
+    return {
+        "status": "success",
+        "template": template.name,
+        "agents_count": len(session.agents),
+        "tasks_count": len(session.tasks),
+        "model": session.model
+    }
+
+@app.post("/api/sessions/{session_id}/start")
+async def start_crew(session_id: str, config: dict):
+    get_session_or_404(session_id)
+    return await schedule_crew(session_id, config)
+
+@app.post("/api/sessions/{session_id}/resume")
+async def resume_crew(session_id: str, config: Optional[dict] = None):
+    """Run a failed, cancelled or interrupted crew again, skipping its finished tasks"""
+    session = get_session_or_404(session_id)
+    if session.status == "completed":
+        raise HTTPException(status_code=409, detail="Session is already completed")
+    config = {"topic": session.topic or "Yapay Zeka Teknolojileri", **(config or {})}
+    return await schedule_crew(session_id, config, resume=True)
+
+async def schedule_crew(session_id: str, config: dict, resume: bool = False) -> dict:
+    if scheduler.is_scheduled(session_id):
+        raise HTTPException(status_code=409, detail="Session is already queued or running")
+    # Claimed in the shared store, so two workers never run the same session
+    previous = sessions.get(session_id)
+    if previous is None or sessions.claim(session_id, "queued", WORKER_ID, WORKER_DEAD_AFTER) is None:
+        raise HTTPException(status_code=409, detail="Session is already queued or running")
     
     topic = config.get("topic", "Yapay Zeka Teknolojileri")
+    priority = int(config.get("priority", 0))
+    # Set use_cache to false when fresh LLM output is required
+    use_cache = bool(config.get("use_cache", True))
+    timeout = float(config.get("timeout") or CREW_TIMEOUT_SECONDS)
     
-    # Start crew execution in background
-    asyncio.create_task(run_crew(session_id, topic))
+    # Queue crew execution; the scheduler starts it when a worker is free
+    try:
+        # run_crew's span starts when a worker picks the crew up; the gap is queue time
+        with tracing.span("start_crew", trace_id=tracing.trace_id_for(session_id),
+                          session_id=session_id, priority=priority) as request_span:
+            position = scheduler.submit(
+                session_id,
+                lambda: tracing.traced(run_crew(session_id, topic, use_cache, timeout, resume), "run_crew",
+                                       parent=request_span, session_id=session_id, topic=topic, resume=resume),
+                priority
+            )
+    except QueueFullError:
+        sessions.update(session_id, status=previous.status)
+        raise HTTPException(status_code=429, detail="Crew queue is full, try again later")
     
-    return {"status": "started", "session_id": session_id}
+    sessions.update(session_id, topic=topic, stats=None, timing=None)
+    results.delete(session_id)
+    if resume:
+        # Earlier events stay so the log shows the whole history
+        return {
+            "status": "queued",
+            "session_id": session_id,
+            "position": position,
+            "restored_tasks": len(sessions.get_task_outputs(session_id))
+        }
+    
+    sessions.clear_logs(session_id)
+    sessions.clear_task_outputs(session_id)
+    
+    return {"status": "queued", "session_id": session_id, "position": position}
 
-async def run_crew(session_id: str, topic: str):
-    """Run the crew and send real-time updates"""
-    session = sessions[session_id]
+@app.post("/api/sessions/{session_id}/cancel")
+async def cancel_crew(session_id: str):
+    """Stop a queued or running crew or batch, on whichever worker holds it"""
+    session = get_session_or_404(session_id)
+    # A run whose worker died has nobody to cancel it
+    if session.status in ACTIVE_STATUSES:
+        orphans = await asyncio.to_thread(sessions.release_orphans, WORKER_DEAD_AFTER)
+        await report_interrupted(orphans)
+        if session_id in orphans:
+            raise HTTPException(status_code=409, detail="Session was interrupted by a worker restart")
+    if scheduler.position(session_id) is None and session.status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail="Session is not queued or running")
     
+    await manager.control("cancel", session_id)
+    return {"status": "cancelled", "session_id": session_id}
+
+async def cancel_local(envelope: dict):
+    """Cancel command from the bus: stop the crew if this worker holds it"""
+    session_id = envelope["session_id"]
+    position = scheduler.position(session_id)
+    if position is None:
+        return
+    
+    token = cancel_tokens.get(session_id)
+    if token:
+        token.cancel()
+    scheduler.cancel(session_id)
+    if position > 0:
+        # Never started; running crews report their cancellation themselves
+        await report_cancelled(session_id, "cancelled")
+
+manager.control_handlers["cancel"] = cancel_local
+
+async def report_cancelled(session_id: str, reason: str):
+    sessions.update(session_id, status="cancelled", completed_at=datetime.now().isoformat())
+    CREW_RUNS.inc(status=reason)
+    await manager.send_message(session_id, {
+        "type": "crew_cancelled",
+        "reason": reason,
+        "message": "⏰ Süre sınırı aşıldı, ekip durduruldu" if reason == "timeout" else "🛑 Ekip durduruldu"
+    })
+
+def new_cancel_token(session_id: str, timeout: float, shared: bool = False) -> CancelToken:
+    """Register the token of a run; ``shared`` makes it visible to pool worker processes"""
+    token = cancel_tokens[session_id] = CancelToken(
+        time.time() + timeout if timeout > 0 else None,
+        cancel_event() if shared else None
+    )
+    return token
+
+async def run_until_deadline(awaitable, token: CancelToken):
+    """Await a crew run; past the token's deadline stop it and raise CrewCancelled"""
     try:
-        # Callback function to send messages
+        return await asyncio.wait_for(awaitable, token.remaining())
+    except asyncio.TimeoutError:
+        if token.reason != "timeout":
+            raise
+        # Crew threads stop at their next checkpoint
+        token.cancel("timeout")
+        raise CrewCancelled("timeout")
+
+async def run_crew(session_id: str, topic: str, use_cache: bool = True, timeout: float = 0,
+                   resume: bool = False):
+    """Run the crew and send real-time updates; ``resume`` skips checkpointed tasks"""
+    started = time.perf_counter()
+    session = sessions.update(
+        session_id,
+        status="running",
+        started_at=datetime.now().isoformat()
+    )
+    
+    stats = live_stats[session_id] = SessionStats()
+    token = new_cancel_token(session_id, timeout, shared=scheduler.mode == "process")
+    
+    try:
+        # Callback function to send messages; called from crew worker threads
+        loop = asyncio.get_running_loop()
+        timing = {}
+        restored = sessions.get_task_outputs(session_id) if resume else None
+        
         def send_update(msg):
+            if msg.get("type") == "task_output":
+                # Checkpoint for /resume; not part of the live feed
+                sessions.save_task_output(session_id, msg["task_index"], msg["output"])
+                return
+            stats.add(msg)
+            observe_event(msg)
+            if msg.get("type") == "crew_timing":
+                timing.update(msg.get("timing", {}))
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.ensure_future(manager.send_message(session_id, msg))
-                else:
-                    loop.create_task(manager.send_message(session_id, msg))
-            except Exception:
-                # Ignore callback errors to not interrupt execution
+                loop.call_soon_threadsafe(manager.post, session_id, msg)
+            except RuntimeError:
+                # Loop already closed (shutdown); drop the update
                 pass
         
-        # Initialize CrewManager with API key from session
-        crew_manager = CrewManager(
-            model_name=session.model,
-            callback=send_update,
-            api_key=session.api_key if session.api_key else None
-        )
+        agent_configs = [AgentConfig(**agent_data) for agent_data in session.agents]
+        task_configs = [TaskConfig(**task_data) for task_data in session.tasks]
+        api_key = session.api_key if session.api_key else None
+        
+        if scheduler.mode == "process":
+            # LLM, agents and tools are built inside the worker process
+            crew_manager = None
+        else:
+            # Initialize CrewManager with API key from session
+            crew_manager = CrewManager(
+                model_name=session.model,
+                callback=send_update,
+                api_key=api_key,
+                use_cache=use_cache
+            )
         
         # Create agents
-        for agent_data in session.agents:
-            agent_config = AgentConfig(**agent_data)
-            crew_manager.add_agent(agent_config)
+        for agent_config in agent_configs:
+            if crew_manager:
+                crew_manager.add_agent(agent_config)
             
             await manager.send_message(session_id, {
                 "type": "agent_created",
-                "agent": agent_data["name"],
+                "agent": agent_config.name,
                 "status": "ready"
             })
         
         # Create tasks
-        for task_data in session.tasks:
-            task_config = TaskConfig(**task_data)
-            crew_manager.add_task(task_config)
+        for task_config in task_configs:
+            if crew_manager:
+                crew_manager.add_task(task_config)
             
             await manager.send_message(session_id, {
                 "type": "task_created",
-                "task": task_data["description"][:50] + "...",
-                "agent": task_data["agent_name"]
+                "task": task_config.description[:50] + "...",
+                "agent": task_config.agent_name
             })
         
         # Run the crew
@@ -289,66 +843,358 @@ async def run_crew(session_id: str, topic: str):
             "message": "Ekip çalışmaya başladı!"
         })
         
-        result = await crew_manager.run(topic)
+        if crew_manager:
+            crew_run = crew_manager.run(topic, executor=scheduler.executor, cancel_token=token, restored=restored)
+        else:
+            crew_run = run_in_process(
+                scheduler.executor, session.model, api_key,
+                agent_configs, task_configs, topic, send_update, use_cache, token, restored
+            )
+        result = await run_until_deadline(crew_run, token)
         
         # Clean and format the result
         result_text = str(result) if result else "No result generated"
         
-        session.result = result_text
-        session.status = "completed"
-        session.completed_at = datetime.now().isoformat()
+        result_size = await asyncio.to_thread(results.write, session_id, result_text)
+        sessions.update(
+            session_id,
+            status="completed",
+            completed_at=datetime.now().isoformat(),
+            timing=timing or None
+        )
+        CREW_RUNS.inc(status="completed")
+        
+        # The result goes out in fixed-size result_chunk frames, then the completion message.
+        # Only the transport is chunked: crewai hands over the last task's output in one piece
+        chunks = split_text(result_text)
+        for index, chunk in enumerate(chunks):
+            await manager.send_message(session_id, {
+                "type": "result_chunk",
+                "index": index,
+                "total": len(chunks),
+                "data": chunk
+            })
         
-        # Send completion message with result
         await manager.send_message(session_id, {
             "type": "crew_completed",
-            "result": result_text,
             "message": "İşlem tamamlandı!",
-            "result_length": len(result_text)
+            "result_length": len(result_text),
+            "result_size": result_size,
+            "download_url": f"/api/sessions/{session_id}/result/download"
         })
         
+    except (CrewCancelled, asyncio.CancelledError) as e:
+        reason = e.reason if isinstance(e, CrewCancelled) else token.reason or "cancelled"
+        token.cancel(reason)
+        await report_cancelled(session_id, reason)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+    
     except Exception as e:
-        session.status = "error"
-        session.logs.append({
+        sessions.update(session_id, status="error")
+        CREW_RUNS.inc(status="error")
+        
+        await manager.send_message(session_id, {
             "type": "error",
             "message": str(e),
             "timestamp": datetime.now().isoformat()
         })
+    
+    finally:
+        CREW_RUN_SECONDS.observe(time.perf_counter() - started)
+        live_stats.pop(session_id, None)
+        cancel_tokens.pop(session_id, None)
+        sessions.update(session_id, stats=stats.snapshot())
+
+@app.post("/api/batches")
+async def start_batch(config: BatchConfig):
+    """Run one crew definition over several topics; progress streams on /ws/{batch_id}"""
+    topics = [topic.strip() for topic in config.topics if topic.strip()]
+    if not topics:
+        raise HTTPException(status_code=400, detail="At least one topic is required")
+    if not config.agents or not config.tasks:
+        raise HTTPException(status_code=400, detail="Agents and tasks are required")
+    try:
+        resolve_dependencies([task.depends_on for task in config.tasks])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    batch_id = str(uuid.uuid4())
+    sessions.create(SessionState(
+        id=batch_id,
+        status="created",
+        agents=[agent.model_dump() for agent in config.agents],
+        tasks=[task.model_dump() for task in config.tasks],
+        model=config.model,
+        api_key=config.api_key or "",
+        current_step=4
+    ))
+    sessions.claim(batch_id, "queued", WORKER_ID, WORKER_DEAD_AFTER)
+    
+    max_parallel = max(1, min(config.max_parallel, CREW_MAX_WORKERS))
+    try:
+        position = scheduler.submit(
+            batch_id,
+            lambda: run_batch_job(batch_id, topics, max_parallel, config.use_cache, config.timeout),
+            config.priority,
+            # Every parallel topic runs a crew, so the batch holds that many slots
+            slots=max_parallel
+        )
+    except QueueFullError:
+        sessions.delete(batch_id)
+        raise HTTPException(status_code=429, detail="Crew queue is full, try again later")
+    
+    return {"status": "queued", "batch_id": batch_id, "topics": len(topics), "position": position}
+
+@app.get("/api/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    """Batch status, and once finished the per-topic result manifest"""
+    session = get_session_or_404(batch_id)
+    return {
+        "batch_id": batch_id,
+        "status": session.status,
+        "started_at": session.started_at,
+        "completed_at": session.completed_at,
+        "manifest": session.batch
+    }
+
+async def run_batch_job(batch_id: str, topics: List[str], max_parallel: int, use_cache: bool = True,
+                        timeout: float = 0):
+    """Build the crew once and run it for every topic of the batch"""
+    session = sessions.update(
+        batch_id,
+        status="running",
+        started_at=datetime.now().isoformat()
+    )
+    stats = live_stats[batch_id] = SessionStats()
+    # One token and deadline for the whole batch
+    token = new_cancel_token(batch_id, timeout)
+    
+    try:
+        loop = asyncio.get_running_loop()
         
-        await manager.send_message(session_id, {
+        def send_update(msg):
+            if msg.get("type") == "task_output":
+                return
+            stats.add(msg)
+            observe_event(msg)
+            try:
+                loop.call_soon_threadsafe(manager.post, batch_id, msg)
+            except RuntimeError:
+                pass
+        
+        # The template crew is never run itself; each topic runs a fork of it
+        crew_manager = CrewManager(
+            model_name=session.model,
+            api_key=session.api_key or None,
+            use_cache=use_cache
+        )
+        for agent_data in session.agents:
+            crew_manager.add_agent(AgentConfig(**agent_data))
+        for task_data in session.tasks:
+            crew_manager.add_task(TaskConfig(**task_data))
+        
+        await manager.send_message(batch_id, {
+            "type": "batch_started",
+            "topics": len(topics),
+            "max_parallel": max_parallel,
+            "message": f"📚 {len(topics)} konu için toplu çalışma başladı"
+        })
+        
+        # Process pools can't share the LLM client, so topics always run on
+        # threads: the crew pool's, or in process mode threads of the batch's
+        # own, sized to the slots it reserved
+        own_executor = None
+        if scheduler.mode == "thread":
+            executor = scheduler.executor
+        else:
+            executor = own_executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="batch")
+        try:
+            manifest = await run_until_deadline(
+                run_batch(crew_manager, topics, max_parallel, send_update, executor, token, results, batch_id), token
+            )
+        finally:
+            if own_executor:
+                own_executor.shutdown(wait=False, cancel_futures=True)
+        
+        for item in manifest["items"]:
+            if item["status"] == "completed":
+                item["download_url"] = f"/api/batches/{batch_id}/results/{item['index'] + 1}/download"
+        sessions.update(
+            batch_id,
+            status="completed" if manifest["completed"] else "error",
+            completed_at=datetime.now().isoformat(),
+            batch=manifest
+        )
+        
+        await manager.send_message(batch_id, {
+            "type": "batch_completed",
+            "completed": manifest["completed"],
+            "failed": manifest["failed"],
+            "wall_time": manifest["wall_time"],
+            "message": f"🏁 Toplu çalışma bitti: {manifest['completed']}/{len(topics)} konu tamamlandı"
+        })
+    
+    except (CrewCancelled, asyncio.CancelledError) as e:
+        reason = e.reason if isinstance(e, CrewCancelled) else token.reason or "cancelled"
+        token.cancel(reason)
+        await report_cancelled(batch_id, reason)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+    
+    except Exception as e:
+        sessions.update(batch_id, status="error")
+        
+        await manager.send_message(batch_id, {
             "type": "error",
-            "message": str(e)
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
         })
+    
+    finally:
+        live_stats.pop(batch_id, None)
+        cancel_tokens.pop(batch_id, None)
+        sessions.update(batch_id, stats=stats.snapshot())
+
+@app.get("/api/llm-cache/stats")
+async def get_llm_cache_stats():
+    cache = llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await asyncio.to_thread(cache.stats)}
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/rate-limits")
+async def get_rate_limits():
+    """Quota waits, quota errors and retries per API key (hashed) and model"""
+    return {"limits": quota_stats()}
+
+@app.get("/api/stats")
+async def get_aggregate_stats(status: Optional[str] = None, limit: int = 200):
+    """Counters summed over the latest ``limit`` sessions, optionally of one status"""
+    listed = await asyncio.to_thread(sessions.list, status, limit)
+    total = SessionStats()
+    statuses = Counter()
+    with_stats = 0
+    for session in listed:
+        statuses[session.status] += 1
+        live = live_stats.get(session.id)
+        snapshot = live.snapshot() if live is not None else session.stats
+        if snapshot is not None:
+            total.merge(snapshot)
+            with_stats += 1
+    snapshot = total.snapshot()
+    del snapshot["tasks"]
+    return {
+        "sessions": len(listed),
+        "sessions_with_stats": with_stats,
+        "statuses": dict(statuses),
+        **snapshot
+    }
+
+@app.get("/api/llm-pool/stats")
+async def get_llm_pool_stats():
+    return llm_pool.stats()
 
 @app.get("/api/sessions/{session_id}/result")
-async def get_result(session_id: str):
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+async def get_result(session_id: str, since: int = 0):
+    session = get_session_or_404(session_id)
+    size = await asyncio.to_thread(results.size, session_id)
+    if size is None:
+        # Sessions finished before results were written to files
+        result = await asyncio.to_thread(sessions.get_result, session_id)
+    elif size <= RESULT_INLINE_MAX_BYTES:
+        result = await asyncio.to_thread(results.read, session_id)
+    else:
+        # Too large to inline; fetch it from download_url
+        result = None
+    logs = await asyncio.to_thread(sessions.get_logs, session_id, since)
     return {
         "status": session.status,
-        "result": session.result,
-        "logs": session.logs,
+        "result": result,
+        "result_size": size,
+        "download_url": f"/api/sessions/{session_id}/result/download" if size is not None else None,
+        "logs": logs,
         "started_at": session.started_at,
         "completed_at": session.completed_at
     }
 
+@app.get("/api/sessions/{session_id}/result/download")
+async def download_result(session_id: str, request: Request):
+    """The result file, streamed in chunks; a single ``Range: bytes=`` range is honoured"""
+    get_session_or_404(session_id)
+    return await stream_result(session_id, request)
+
+@app.get("/api/batches/{batch_id}/results/{number}/download")
+async def download_batch_result(batch_id: str, number: int, request: Request):
+    """Result of topic ``number`` (1-based) of a batch, like /result/download"""
+    get_session_or_404(batch_id)
+    return await stream_result(topic_result_key(batch_id, number - 1), request)
+
+async def stream_result(key: str, request: Request) -> StreamingResponse:
+    size = await asyncio.to_thread(results.size, key)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{key}.md"'
+    }
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError as e:
+        raise HTTPException(status_code=416, detail=str(e), headers={"Content-Range": f"bytes */{size}"})
+    
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    
+    return StreamingResponse(
+        results.iter_bytes(key, start, end),
+        status_code=status_code,
+        media_type="text/markdown; charset=utf-8",
+        headers=headers
+    )
+
+@app.get("/api/sessions/{session_id}/events")
+async def get_events(session_id: str, since: int = 0, limit: int = 500):
+    """Logged events after ``since``; poll with the returned last_seq"""
+    get_session_or_404(session_id)
+    events = await asyncio.to_thread(sessions.get_logs, session_id, since, limit)
+    return {
+        "events": events,
+        "last_seq": events[-1]["seq"] if events else since
+    }
+
 @app.get("/api/sessions/{session_id}/stats")
 async def get_stats(session_id: str):
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = get_session_or_404(session_id)
     
-    session = sessions[session_id]
+    # Running here: live counters; finished: the stored snapshot.
+    # Otherwise (running on another worker, older sessions) one pass over the log
+    if session_id in live_stats:
+        snapshot = live_stats[session_id].snapshot()
+    elif session.stats is not None:
+        snapshot = session.stats
+    else:
+        logs = await asyncio.to_thread(sessions.get_logs, session_id)
+        snapshot = SessionStats.from_events(logs).snapshot()
     
-    # Calculate stats
     agent_stats = []
     for agent in session.agents:
-        agent_logs = [log for log in session.logs if log.get("agent") == agent["name"]]
+        counters = snapshot["agents"].get(agent["name"], {})
         agent_stats.append({
             "name": agent["name"],
             "role": agent["role"],
-            "tasks_completed": len([l for l in agent_logs if l.get("type") == "task_completed"]),
-            "messages_sent": len([l for l in agent_logs if l.get("type") == "message"])
+            "tasks_completed": counters.get("tasks_completed", 0),
+            "messages_sent": counters.get("messages_sent", 0),
+            **{k: v for k, v in counters.items() if k not in ("tasks_completed", "messages_sent")}
         })
     
     return {
@@ -357,12 +1203,18 @@ async def get_stats(session_id: str):
         "total_agents": len(session.agents),
         "total_tasks": len(session.tasks),
         "agent_stats": agent_stats,
-        "total_logs": len(session.logs)
+        "total_logs": snapshot["events"],
+        "event_types": snapshot.get("types", {}),
+        "task_stats": snapshot["tasks"],
+        "llm": snapshot["llm"],
+        "tools": snapshot["tools"],
+        "timing": session.timing
     }
 
 @app.websocket("/ws/{session_id}")
-async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    await manager.connect(websocket, session_id)
+async def websocket_endpoint(websocket: WebSocket, session_id: str, since: Optional[int] = None):
+    # ?since=<seq> replays everything logged after that event before going live
+    await manager.connect(websocket, session_id, since)
     try:
         while True:
             data = await websocket.receive_text()
@@ -370,8 +1222,10 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             message = json.loads(data)
             if message.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
+            elif message.get("type") == "resume":
+                await manager.replay(session_id, int(message.get("since", 0)))
     except WebSocketDisconnect:
-        manager.disconnect(session_id)
+        manager.disconnect(session_id, websocket)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,130 @@
+"""
+Outbound Buffer - WebSocket olaylarının toplu ve sınırlı gönderimi
+"""
+
+from collections import deque
+from typing import List, Optional, Tuple
+
+# Only the latest of consecutive events of these types (per agent) is kept
+COALESCED_TYPES = {"agent_thinking"}
+
+# Consecutive events of these types (per agent) are merged by joining this field
+CONCATENATED_FIELDS = {"agent_token": "token"}
+
+# Live-only events that are not written to the session event log
+EPHEMERAL_TYPES = {"queue_update", "agent_token", "result_chunk"}
+
+# Events that always go out in a frame of their own (large payloads)
+STANDALONE_TYPES = {"result_chunk"}
+
+# Live-only events that may be discarded when a client falls behind; logged
+# events of these types are read back from the event log instead
+DROPPABLE_TYPES = {"agent_thinking", "agent_action", "agent_token", "queue_update"}
+
+
+class OutboundBuffer:
+    """Bounded per-client event buffer with coalescing and a drop policy.
+
+    When the buffer is full the oldest droppable live-only event (one without
+    a ``seq``) is discarded and counted. If there is none, every logged event
+    (one with a ``seq``) is evicted at once and ``gap`` is set: the sender
+    then reads them back from the session event log. Other events, such as
+    ``crew_completed`` before it is logged or ``result_chunk``, are never
+    evicted; the buffer grows past ``max_events`` for them instead.
+    """
+
+    def __init__(self, max_events: int = 500):
+        self.max_events = max_events
+        self._events: deque = deque()
+        self.dropped = 0
+        self.gap = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def append(self, event: dict):
+        if self._events and self._coalesce(self._events[-1], event):
+            return
+        if len(self._events) >= self.max_events:
+            self._evict()
+        self._events.append(event)
+
+    def extend(self, events: List[dict]):
+        for event in events:
+            self.append(event)
+
+    def drain(self) -> Tuple[List[dict], int, bool]:
+        """Take all buffered events, the number dropped and whether logged events were evicted"""
+        events, dropped, gap = list(self._events), self.dropped, self.gap
+        self._events.clear()
+        self.dropped = 0
+        self.gap = False
+        return events, dropped, gap
+
+    def _coalesce(self, last: dict, event: dict) -> bool:
+        event_type = event.get("type")
+        if last.get("type") != event_type or last.get("agent") != event.get("agent"):
+            return False
+        if event_type in COALESCED_TYPES:
+            self._events[-1] = event
+            return True
+        merged = concatenate(last, event)
+        if merged is not None:
+            self._events[-1] = merged
+            return True
+        return False
+
+    def _evict(self):
+        for i, event in enumerate(self._events):
+            if event.get("type") in DROPPABLE_TYPES and event.get("seq") is None:
+                del self._events[i]
+                self.dropped += 1
+                return
+        kept = deque(event for event in self._events if event.get("seq") is None)
+        if len(kept) < len(self._events):
+            self._events = kept
+            self.gap = True
+
+
+def concatenate(last: dict, event: dict) -> Optional[dict]:
+    """``last`` and ``event`` merged into one if both are ``CONCATENATED_FIELDS`` events of one agent"""
+    event_type = event.get("type")
+    field = CONCATENATED_FIELDS.get(event_type)
+    if field is None or last.get("type") != event_type or last.get("agent") != event.get("agent"):
+        return None
+    return {**last, field: last.get(field, "") + event.get(field, "")}
+
+
+def dropped_notice(dropped: int) -> dict:
+    return {
+        "type": "events_dropped",
+        "count": dropped,
+        "message": f"⚠️ Bağlantı yavaş, {dropped} canlı olay atlandı"
+    }
+
+
+def build_frame(events: List[dict], dropped: int = 0) -> dict:
+    """Single events go out as-is, several as one ``batch`` frame"""
+    if dropped:
+        events = events + [dropped_notice(dropped)]
+    if len(events) == 1:
+        return events[0]
+    return {"type": "batch", "events": events}
+
+
+def build_frames(events: List[dict], dropped: int = 0) -> List[dict]:
+    """Like ``build_frame``, but every ``STANDALONE_TYPES`` event gets a frame of its own"""
+    if dropped:
+        events = events + [dropped_notice(dropped)]
+    frames, current = [], []
+    for event in events:
+        if event.get("type") in STANDALONE_TYPES:
+            if current:
+                frames.append(build_frame(current))
+                current = []
+            frames.append(event)
+        else:
+            current.append(event)
+    if current:
+        frames.append(build_frame(current))
+    return frames
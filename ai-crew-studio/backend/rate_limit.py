@@ -0,0 +1,158 @@
+"""
+Rate Limit - Token bucket hız sınırlayıcı ve kota yönetimi
+"""
+
+import time
+import random
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take ``tokens``, sleeping until they are available; returns seconds waited"""
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def consume(self, tokens: float):
+        """Take ``tokens`` without waiting; the bucket may go into debt"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - tokens)
+
+    def drain(self):
+        """Empty the bucket so the next callers wait for a refill"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """True for provider rate-limit / quota errors (HTTP 429, RESOURCE_EXHAUSTED)"""
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    text = str(error)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text or "quota" in text.lower()
+
+
+class QuotaLimiter:
+    """Requests-per-minute and tokens-per-minute limits of one API key and model.
+
+    Callers reserve a request and their estimated tokens before calling the
+    provider and settle the real token count afterwards. A quota error drains
+    both buckets, so every caller sharing the key backs off together.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm / 60, rpm)
+        self.tokens = TokenBucket(tpm / 60, tpm)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.quota_errors = 0
+        self.retries = 0
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Block until a request fits in both limits; returns seconds waited"""
+        waited = self.requests.acquire(1) + self.tokens.acquire(estimated_tokens)
+        with self._lock:
+            self.calls += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += waited
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        if actual_tokens > estimated_tokens:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def penalize(self):
+        """Record a quota error and make every caller wait for a refill"""
+        with self._lock:
+            self.quota_errors += 1
+        self.requests.drain()
+        self.tokens.drain()
+
+    def note_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "quota_errors": self.quota_errors,
+                "retries": self.retries
+            }
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff for retry number ``attempt`` (from 1)"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def call_with_retry(fn: Callable[[], T], limiter: QuotaLimiter, max_retries: int = 5,
+                    on_retry: Optional[Callable[[int, float, BaseException], None]] = None) -> T:
+    """Call ``fn``, retrying quota errors with jittered exponential backoff"""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if not is_quota_error(e) or attempt >= max_retries:
+                raise
+            attempt += 1
+            limiter.penalize()
+            limiter.note_retry()
+            delay = backoff_delay(attempt)
+            if on_retry:
+                on_retry(attempt, delay, e)
+            time.sleep(delay)
+
+
+_limiters: Dict[Tuple[str, str], QuotaLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_quota_limiter(api_key: str, model: str, rpm: float, tpm: float) -> QuotaLimiter:
+    """Process-wide limiter shared by every client of ``api_key`` and ``model``"""
+    key = (hashlib.sha256(api_key.encode()).hexdigest()[:12], model)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = QuotaLimiter(rpm, tpm)
+        return _limiters[key]
+
+
+def quota_stats() -> list:
+    with _limiters_lock:
+        items = list(_limiters.items())
+    return [{"key": key_hash, "model": model, **limiter.stats()} for (key_hash, model), limiter in items]
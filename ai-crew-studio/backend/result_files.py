@@ -0,0 +1,113 @@
+"""
+Result Files - Ekip sonuçlarının oturum başına dosyada saklanması ve parça parça okunması
+"""
+
+import os
+import re
+import time
+from typing import Iterator, List, Optional, Tuple
+
+# Characters per result_chunk WebSocket frame / bytes per download read
+RESULT_CHUNK_SIZE = int(os.environ.get("RESULT_CHUNK_SIZE", str(64 * 1024)))
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def split_text(text: str, chunk_size: int = RESULT_CHUNK_SIZE) -> List[str]:
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) of a single ``bytes=`` range.
+
+    Returns None when there is no usable Range header (send the whole file)
+    and raises ValueError when the range can't be satisfied.
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, end
+
+
+class ResultFiles:
+    """Final crew outputs as UTF-8 files in ``directory``, one per session.
+
+    Results are written chunk by chunk to a temporary file that replaces the
+    previous result in one rename, so readers never see a partial file.
+    Reads go through ``iter_bytes`` so a download never holds the whole file.
+    """
+
+    def __init__(self, directory: str = "results", chunk_size: int = RESULT_CHUNK_SIZE):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, session_id: str) -> str:
+        # Session ids are generated UUIDs; keep anything else out of the path
+        return os.path.join(self.directory, os.path.basename(session_id) + ".md")
+
+    def write(self, session_id: str, text: str) -> int:
+        """Store ``text`` as the result of ``session_id`` and return its size in bytes"""
+        path = self.path(session_id)
+        partial = path + ".part"
+        size = 0
+        with open(partial, "wb") as f:
+            for chunk in split_text(text, self.chunk_size):
+                data = chunk.encode("utf-8")
+                f.write(data)
+                size += len(data)
+        os.replace(partial, path)
+        return size
+
+    def size(self, session_id: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self.path(session_id))
+        except OSError:
+            return None
+
+    def read(self, session_id: str) -> Optional[str]:
+        try:
+            with open(self.path(session_id), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def iter_bytes(self, session_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Bytes ``start``..``end`` (inclusive) of the result, ``chunk_size`` at a time"""
+        with open(self.path(session_id), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                data = f.read(self.chunk_size if remaining is None else min(self.chunk_size, remaining))
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+
+    def evict_expired(self, ttl_seconds: float) -> int:
+        """Delete result files not written for longer than ``ttl_seconds``"""
+        cutoff = time.time() - ttl_seconds
+        evicted = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    evicted += 1
+            except OSError:
+                pass
+        return evicted
+
+    def delete(self, session_id: str):
+        try:
+            os.unlink(self.path(session_id))
+        except OSError:
+            pass
@@ -0,0 +1,183 @@
+"""
+Crew Scheduler - Sınırlı eşzamanlılık ve kabul kuyruğu
+"""
+
+import heapq
+import itertools
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the admission queue cannot accept another crew"""
+
+
+@dataclass(order=True)
+class _QueuedJob:
+    priority: int
+    seq: int
+    session_id: str = field(compare=False)
+    job: Callable[[], Awaitable] = field(compare=False)
+    slots: int = field(default=1, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class CrewScheduler:
+    """Runs crew jobs with bounded concurrency behind a priority/FIFO queue.
+
+    Lower ``priority`` values run first; jobs with equal priority run in
+    submission order. A job holds ``slots`` of the ``max_workers`` executor
+    slots while it runs (a batch reserves one per parallel topic), and the
+    head of the queue waits until enough are free. ``on_position`` is awaited with ``(session_id, position)``
+    whenever a waiting job's place in the queue changes. ``mode`` selects a
+    thread pool or a process pool for the executor jobs hand their work to;
+    ``initializer`` runs once in every worker process when it starts.
+    """
+
+    MODES = ("thread", "process")
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 32,
+                 on_position: Optional[Callable[[str, int], Awaitable]] = None,
+                 mode: str = "thread", initializer: Optional[Callable[[], object]] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.on_position = on_position
+        self.initializer = initializer
+        self.executor: Optional[Executor] = None
+        self._queue: List[_QueuedJob] = []
+        self._counter = itertools.count()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._free_slots = max_workers
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Create the executor and the worker tasks"""
+        if self.mode == "process":
+            # spawn, not fork: the server process already runs threads
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer
+            )
+        else:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="crew"
+            )
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_workers)
+        ]
+
+    async def stop(self):
+        """Cancel workers and running jobs, then shut the executor down"""
+        for task in list(self._running.values()) + self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue.clear()
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for item in self._queue if not item.cancelled)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def busy_slots(self) -> int:
+        return self.max_workers - self._free_slots
+
+    def submit(self, session_id: str, job: Callable[[], Awaitable],
+               priority: int = 0, slots: int = 1) -> int:
+        """Queue a job that needs ``slots`` executor slots and return its 1-based position"""
+        if self.is_scheduled(session_id):
+            raise ValueError(f"Session already scheduled: {session_id}")
+        if self.queue_depth >= self.max_queue_size:
+            raise QueueFullError("Crew queue is full")
+
+        slots = max(1, min(slots, self.max_workers))
+        heapq.heappush(self._queue, _QueuedJob(priority, next(self._counter), session_id, job, slots))
+        self._wakeup.set()
+        return self.position(session_id)
+
+    def position(self, session_id: str) -> Optional[int]:
+        """1-based queue position, 0 if running, None if unknown"""
+        if session_id in self._running:
+            return 0
+        waiting = sorted(item for item in self._queue if not item.cancelled)
+        for i, item in enumerate(waiting, 1):
+            if item.session_id == session_id:
+                return i
+        return None
+
+    def is_scheduled(self, session_id: str) -> bool:
+        return self.position(session_id) is not None
+
+    def cancel(self, session_id: str) -> bool:
+        """Drop a waiting job or cancel a running one"""
+        if session_id in self._running:
+            self._running[session_id].cancel()
+            return True
+        for item in self._queue:
+            if item.session_id == session_id and not item.cancelled:
+                item.cancelled = True
+                asyncio.create_task(self._notify_positions())
+                return True
+        return False
+
+    def _admit(self) -> Optional[_QueuedJob]:
+        """Pop the head of the queue if its slots are free"""
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+        if not self._queue or self._queue[0].slots > self._free_slots:
+            return None
+        item = heapq.heappop(self._queue)
+        self._free_slots -= item.slots
+        return item
+
+    async def _worker(self):
+        while True:
+            item = self._admit()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            task = asyncio.create_task(item.job())
+            self._running[item.session_id] = task
+            await self._notify_positions()
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Only swallow cancellation of the job, not of the worker
+                if asyncio.current_task().cancelling():
+                    raise
+            except Exception:
+                # Jobs report their own errors; keep the worker alive
+                pass
+            finally:
+                self._running.pop(item.session_id, None)
+                self._free_slots += item.slots
+                self._wakeup.set()
+
+    async def _notify_positions(self):
+        if not self.on_position:
+            return
+        waiting = sorted(item for item in self._queue if not item.cancelled)
+        for i, item in enumerate(waiting, 1):
+            try:
+                await self.on_position(item.session_id, i)
+            except Exception:
+                pass
@@ -0,0 +1,93 @@
+"""
+Search Client - Paylaşılan, önbellekli DuckDuckGo arama istemcisi
+"""
+
+import threading
+from typing import List, Tuple
+
+from caching import SingleFlight, TTLCache
+from rate_limit import TokenBucket
+
+# DDGS client class, imported on the first search (see load_ddgs)
+DDGS = None
+
+
+def load_ddgs():
+    global DDGS
+    if DDGS is None:
+        try:
+            from ddgs import DDGS as client_class
+        except ImportError:
+            from duckduckgo_search import DDGS as client_class
+        DDGS = client_class
+    return DDGS
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchClient:
+    """One DDGS client shared by every crew in the process.
+
+    Results are cached per normalized query, identical queries that are in
+    flight at the same time share one upstream call, and upstream calls are
+    throttled by a token bucket.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, max_entries: int = 1024,
+                 rate_per_second: float = 1.0, burst: int = 3):
+        self._cache = TTLCache(ttl_seconds, max_entries)
+        self._flight = SingleFlight()
+        self._limiter = TokenBucket(rate_per_second, burst)
+        self._ddgs = None
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+
+    def text(self, query: str, max_results: int = 3) -> List[dict]:
+        return self.lookup(query, max_results)[0]
+
+    def lookup(self, query: str, max_results: int = 3) -> Tuple[List[dict], bool]:
+        """Results for ``query`` and whether they came from the cache"""
+        key = (normalize_query(query), max_results)
+        results = self._cache.get(key)
+        if results is not None:
+            return results, True
+        return self._flight.do(key, lambda: self._fetch(key)), False
+
+    def _fetch(self, key: tuple) -> List[dict]:
+        query, max_results = key
+        client = self._client()
+        try:
+            results = self._search(client, query, max_results)
+        except Exception:
+            # The client may be stuck on a dead session; rebuild it once
+            with self._lock:
+                if self._ddgs is client:
+                    self._ddgs = None
+            results = self._search(self._client(), query, max_results)
+        self._cache.set(key, results)
+        return results
+
+    def _client(self):
+        # Only creating the client is locked; searches for different keys run
+        # in parallel and identical ones are already merged by single-flight
+        with self._lock:
+            if self._ddgs is None:
+                self._ddgs = load_ddgs()()
+            return self._ddgs
+
+    def _search(self, client, query: str, max_results: int) -> List[dict]:
+        self._limiter.acquire()
+        with self._lock:
+            self.upstream_calls += 1
+        return list(client.text(query, max_results=max_results))
+
+    def stats(self) -> dict:
+        return {
+            "cache_hits": self._cache.hits,
+            "cache_misses": self._cache.misses,
+            "deduplicated": self._flight.shared,
+            "upstream_calls": self.upstream_calls,
+            "cached_queries": len(self._cache)
+        }
@@ -0,0 +1,157 @@
+"""
+Session Stats - Oturum başına token, süre ve önbellek istatistikleri
+"""
+
+import threading
+from collections import Counter
+from typing import Dict, Iterable
+
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total, 4) if total else 0.0
+
+
+def _new_agent() -> dict:
+    return {
+        "tasks_completed": 0,
+        "messages_sent": 0,
+        "task_time": 0.0,
+        "llm_calls": 0,
+        "llm_time": 0.0,
+        "llm_cache_hits": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "tool_calls": 0,
+        "tool_time": 0.0
+    }
+
+
+def _new_tool() -> dict:
+    return {"calls": 0, "errors": 0, "cache_hits": 0, "time": 0.0, "max_latency": 0.0}
+
+
+# Task events and the status they leave the task in
+_TASK_STATUS = {"task_executing": "running", "task_completed": "completed", "task_restored": "restored"}
+
+
+class SessionStats:
+    """Counters of one crew run, updated as each event arrives.
+
+    ``add`` is O(1) per event, so reading the stats never rescans the log.
+    Events may come from several crew threads at once. ``merge`` adds up
+    snapshots of other runs, for totals across sessions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events = 0
+        self.types: Counter = Counter()
+        self.agents: Dict[str, dict] = {}
+        self.tasks: Dict[int, dict] = {}
+        self.tools: Dict[str, dict] = {}
+
+    @classmethod
+    def from_events(cls, events: Iterable[dict]) -> "SessionStats":
+        stats = cls()
+        for event in events:
+            stats.add(event)
+        return stats
+
+    def _agent(self, name) -> dict:
+        if name not in self.agents:
+            self.agents[name] = _new_agent()
+        return self.agents[name]
+
+    def add(self, event: dict):
+        event_type = event.get("type")
+        agent_name = event.get("agent")
+        with self._lock:
+            self.events += 1
+            self.types[event_type] += 1
+            if event_type in _TASK_STATUS:
+                task = self.tasks.setdefault(event.get("task_number"), {
+                    "task_number": event.get("task_number"),
+                    "agent": agent_name,
+                    "duration": None
+                })
+                task["status"] = _TASK_STATUS[event_type]
+                if event_type == "task_completed":
+                    agent = self._agent(agent_name)
+                    agent["tasks_completed"] += 1
+                    agent["task_time"] += event.get("duration") or 0.0
+                    task["duration"] = event.get("duration")
+            elif event_type == "message":
+                self._agent(agent_name)["messages_sent"] += 1
+            elif event_type == "llm_call":
+                agent = self._agent(agent_name)
+                agent["llm_calls"] += 1
+                agent["llm_time"] += event.get("duration", 0.0)
+                agent["prompt_tokens"] += event.get("prompt_tokens", 0)
+                agent["completion_tokens"] += event.get("completion_tokens", 0)
+                agent["llm_cache_hits"] += 1 if event.get("cached") else 0
+            elif event_type == "tool_call":
+                agent = self._agent(agent_name)
+                agent["tool_calls"] += 1
+                agent["tool_time"] += event.get("duration", 0.0)
+                tool = self.tools.setdefault(event.get("tool"), _new_tool())
+                tool["calls"] += 1
+                tool["time"] += event.get("duration", 0.0)
+                tool["max_latency"] = max(tool["max_latency"], event.get("duration", 0.0))
+                tool["cache_hits"] += 1 if event.get("cached") else 0
+                tool["errors"] += 1 if event.get("error") else 0
+
+    def merge(self, snapshot: dict):
+        """Add the counters of another run's ``snapshot()``; its tasks are not kept"""
+        with self._lock:
+            self.events += snapshot.get("events", 0)
+            self.types.update(snapshot.get("types", {}))
+            for name, values in snapshot.get("agents", {}).items():
+                agent = self._agent(name)
+                for key in agent:
+                    agent[key] += values.get(key, 0)
+            for name, values in snapshot.get("tools", {}).items():
+                tool = self.tools.setdefault(name, _new_tool())
+                for key in ("calls", "errors", "cache_hits", "time"):
+                    tool[key] += values.get(key, 0)
+                tool["max_latency"] = max(tool["max_latency"], values.get("max_latency", 0.0))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            agents = {name: dict(values) for name, values in self.agents.items()}
+            tasks = sorted((dict(t) for t in self.tasks.values()), key=lambda t: t["task_number"] or 0)
+            tools = {name: dict(values) for name, values in self.tools.items()}
+            types = dict(self.types)
+            events = self.events
+
+        llm_calls = sum(a["llm_calls"] for a in agents.values())
+        llm_hits = sum(a["llm_cache_hits"] for a in agents.values())
+        llm_time = sum(a["llm_time"] for a in agents.values())
+        prompt_tokens = sum(a["prompt_tokens"] for a in agents.values())
+        completion_tokens = sum(a["completion_tokens"] for a in agents.values())
+
+        for values in agents.values():
+            for key in ("task_time", "llm_time", "tool_time"):
+                values[key] = round(values[key], 3)
+        for values in tools.values():
+            values["avg_latency"] = round(values["time"] / values["calls"], 3) if values["calls"] else 0.0
+            values["cache_hit_rate"] = _rate(values["cache_hits"], values["calls"])
+            values["time"] = round(values["time"], 3)
+            values["max_latency"] = round(values["max_latency"], 3)
+
+        return {
+            "events": events,
+            "types": types,
+            "agents": agents,
+            "tasks": tasks,
+            "llm": {
+                "calls": llm_calls,
+                "time": round(llm_time, 3),
+                "avg_latency": round(llm_time / llm_calls, 3) if llm_calls else 0.0,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "cache_hits": llm_hits,
+                "cache_hit_rate": _rate(llm_hits, llm_calls)
+            },
+            "tools": tools
+        }
@@ -0,0 +1,536 @@
+"""
+Session Store - Oturum durumunun kalıcı saklanması
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from event_log import EventLog, EventRecord
+
+# Sessions in these states are eligible for TTL eviction
+TERMINAL_STATUSES = ("completed", "error", "cancelled", "interrupted")
+# A session in one of these states is owned by the worker that claimed it
+ACTIVE_STATUSES = ("queued", "running")
+# Status of an active session whose worker stopped heartbeating; /resume picks it up
+INTERRUPTED = "interrupted"
+
+
+class SessionState(BaseModel):
+    id: str
+    status: str
+    agents: List[dict] = []
+    tasks: List[dict] = []
+    model: str = ""
+    api_key: str = ""
+    # Topic of the last /start, reused by /resume
+    topic: str = ""
+    current_step: int = 0
+    logs: List[dict] = []
+    result: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    # Per-task durations and critical path of the last run
+    timing: Optional[dict] = None
+    # Result manifest of a batch run (POST /api/batches)
+    batch: Optional[dict] = None
+    # Token, latency and cache counters of the last run (session_stats.SessionStats)
+    stats: Optional[dict] = None
+
+
+# Large fields that are stored apart from the session row and loaded on demand
+_LAZY_FIELDS = {"logs", "result"}
+
+
+class SessionStore:
+    """Interface for session persistence.
+
+    ``logs`` and ``result`` are never written by ``create``/``update``; use
+    ``append_events``/``clear_logs`` and ``set_result`` for them, and ask for
+    them explicitly in ``get`` when they are needed.
+
+    ``logs`` is an append-only event log. Every appended event gets a ``seq``
+    that increases per session and is never reused, even after
+    ``clear_logs``, so clients can resume from the last ``seq`` they saw.
+    """
+
+    def create(self, session: SessionState):
+        raise NotImplementedError
+
+    def get(self, session_id: str, include_result: bool = False,
+            include_logs: bool = False) -> Optional[SessionState]:
+        raise NotImplementedError
+
+    def update(self, session_id: str, **fields) -> Optional[SessionState]:
+        """Apply field changes and return the updated (light) session"""
+        raise NotImplementedError
+
+    def claim(self, session_id: str, status: str, owner: str, dead_after: float,
+              **fields) -> Optional[SessionState]:
+        """Compare-and-set: move the session to ``status`` for ``owner`` unless it is already active.
+
+        Returns the updated session, or None if it is missing or a live worker
+        holds it. An active session whose owner has not sent a ``heartbeat``
+        for ``dead_after`` seconds is taken over.
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, owner: str):
+        """Mark worker ``owner`` alive now"""
+        raise NotImplementedError
+
+    def retire(self, owner: str):
+        """Forget worker ``owner`` (clean shutdown), so its claims can be taken over at once"""
+        raise NotImplementedError
+
+    def release_orphans(self, dead_after: float) -> List[str]:
+        """Mark active sessions of workers silent for ``dead_after`` seconds interrupted; returns their ids"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[SessionState]:
+        """Light sessions, most recently started first"""
+        raise NotImplementedError
+
+    def set_result(self, session_id: str, result: Optional[str]):
+        raise NotImplementedError
+
+    def get_result(self, session_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def append_events(self, session_id: str, events: List[dict]) -> List[dict]:
+        """Append events and return copies carrying their ``seq``"""
+        raise NotImplementedError
+
+    def append_log(self, session_id: str, entry: dict) -> dict:
+        return self.append_events(session_id, [entry])[0]
+
+    def get_logs(self, session_id: str, since: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """Events with ``seq`` greater than ``since``, oldest first"""
+        raise NotImplementedError
+
+    def clear_logs(self, session_id: str):
+        raise NotImplementedError
+
+    def save_task_output(self, session_id: str, task_index: int, output: str):
+        """Checkpoint the full output of a finished task"""
+        raise NotImplementedError
+
+    def get_task_outputs(self, session_id: str) -> Dict[int, str]:
+        raise NotImplementedError
+
+    def clear_task_outputs(self, session_id: str):
+        raise NotImplementedError
+
+    def evict_expired(self, ttl_seconds: float) -> int:
+        """Delete finished sessions idle for longer than ``ttl_seconds``"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store, mainly for development.
+
+    Each session's events live in a bounded ``EventLog``; past its capacity
+    the oldest ones are spilled to a temporary file.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionState] = {}
+        self._results: Dict[str, Optional[str]] = {}
+        self._logs: Dict[str, EventLog] = {}
+        self._task_outputs: Dict[str, Dict[int, str]] = {}
+        self._last_seq: Dict[str, int] = {}
+        self._updated_at: Dict[str, float] = {}
+        # Session id -> worker that claimed it, worker -> last heartbeat
+        self._owners: Dict[str, str] = {}
+        self._beats: Dict[str, float] = {}
+        # append_events and claim run in worker threads
+        self._lock = threading.Lock()
+
+    def create(self, session: SessionState):
+        self._sessions[session.id] = session.model_copy(update={"logs": [], "result": None})
+        self._updated_at[session.id] = time.time()
+
+    def get(self, session_id, include_result=False, include_logs=False):
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        update = {}
+        if include_result:
+            update["result"] = self._results.get(session_id)
+        if include_logs:
+            update["logs"] = self.get_logs(session_id)
+        return session.model_copy(update=update, deep=True)
+
+    def update(self, session_id, **fields):
+        if session_id not in self._sessions:
+            return None
+        fields = {k: v for k, v in fields.items() if k not in _LAZY_FIELDS}
+        self._sessions[session_id] = self._sessions[session_id].model_copy(update=fields)
+        self._updated_at[session_id] = time.time()
+        return self.get(session_id)
+
+    def _owner_alive(self, session_id: str, dead_after: float) -> bool:
+        beat = self._beats.get(self._owners.get(session_id))
+        return beat is not None and time.time() - beat < dead_after
+
+    def claim(self, session_id, status, owner, dead_after, **fields):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.status in ACTIVE_STATUSES and self._owner_alive(session_id, dead_after):
+                return None
+            self._owners[session_id] = owner
+            return self.update(session_id, status=status, **fields)
+
+    def heartbeat(self, owner):
+        self._beats[owner] = time.time()
+
+    def retire(self, owner):
+        self._beats.pop(owner, None)
+
+    def release_orphans(self, dead_after):
+        with self._lock:
+            orphans = [
+                sid for sid, session in self._sessions.items()
+                if session.status in ACTIVE_STATUSES and not self._owner_alive(sid, dead_after)
+            ]
+            for sid in orphans:
+                self.update(sid, status=INTERRUPTED)
+        return orphans
+
+    def delete(self, session_id):
+        self.clear_logs(session_id)
+        for table in (self._sessions, self._results, self._task_outputs, self._last_seq, self._updated_at,
+                      self._owners):
+            table.pop(session_id, None)
+
+    def list(self, status=None, limit=100):
+        sessions = [s for s in self._sessions.values() if status is None or s.status == status]
+        sessions.sort(key=lambda s: s.started_at or "", reverse=True)
+        return [s.model_copy(deep=True) for s in sessions[:limit]]
+
+    def set_result(self, session_id, result):
+        self._results[session_id] = result
+
+    def get_result(self, session_id):
+        return self._results.get(session_id)
+
+    def append_events(self, session_id, events):
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None:
+                log = self._logs[session_id] = EventLog()
+            seq = self._last_seq.get(session_id, 0)
+            stored = []
+            for event in events:
+                seq += 1
+                stored.append({**event, "seq": seq})
+                log.append(EventRecord.from_dict(stored[-1]))
+            self._last_seq[session_id] = seq
+        return stored
+
+    def get_logs(self, session_id, since=0, limit=None):
+        log = self._logs.get(session_id)
+        return log.records(since, limit) if log is not None else []
+
+    def clear_logs(self, session_id):
+        log = self._logs.pop(session_id, None)
+        if log is not None:
+            log.close()
+
+    def save_task_output(self, session_id, task_index, output):
+        self._task_outputs.setdefault(session_id, {})[task_index] = output
+
+    def get_task_outputs(self, session_id):
+        return dict(self._task_outputs.get(session_id, {}))
+
+    def clear_task_outputs(self, session_id):
+        self._task_outputs.pop(session_id, None)
+
+    def evict_expired(self, ttl_seconds):
+        cutoff = time.time() - ttl_seconds
+        expired = [
+            sid for sid, session in self._sessions.items()
+            if session.status in TERMINAL_STATUSES and self._updated_at.get(sid, 0) < cutoff
+        ]
+        for sid in expired:
+            self.delete(sid)
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite store in WAL mode; safe to share between uvicorn workers"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            started_at TEXT,
+            updated_at REAL NOT NULL,
+            last_seq INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status, updated_at);
+        CREATE INDEX IF NOT EXISTS idx_sessions_started_at ON sessions (started_at);
+        CREATE TABLE IF NOT EXISTS session_results (
+            session_id TEXT PRIMARY KEY,
+            result TEXT
+        );
+        CREATE TABLE IF NOT EXISTS session_events (
+            session_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            entry TEXT NOT NULL,
+            PRIMARY KEY (session_id, seq)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS session_task_outputs (
+            session_id TEXT NOT NULL,
+            task_index INTEGER NOT NULL,
+            output TEXT NOT NULL,
+            PRIMARY KEY (session_id, task_index)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS session_claims (
+            session_id TEXT PRIMARY KEY,
+            owner TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS workers (
+            id TEXT PRIMARY KEY,
+            heartbeat_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = "sessions.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _execute(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _row_data(session: SessionState) -> str:
+        return session.model_dump_json(exclude=_LAZY_FIELDS)
+
+    def create(self, session):
+        self._execute(
+            "INSERT OR REPLACE INTO sessions (id, status, started_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            (session.id, session.status, session.started_at, time.time(), self._row_data(session))
+        )
+
+    def get(self, session_id, include_result=False, include_logs=False):
+        rows = self._execute("SELECT data FROM sessions WHERE id = ?", (session_id,))
+        if not rows:
+            return None
+        session = SessionState.model_validate_json(rows[0][0])
+        if include_result:
+            session.result = self.get_result(session_id)
+        if include_logs:
+            session.logs = self.get_logs(session_id)
+        return session
+
+    def update(self, session_id, **fields):
+        fields = {k: v for k, v in fields.items() if k not in _LAZY_FIELDS}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchall()
+                if not rows:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                session = SessionState.model_validate_json(rows[0][0]).model_copy(update=fields)
+                self._conn.execute(
+                    "UPDATE sessions SET status = ?, started_at = ?, updated_at = ?, data = ? WHERE id = ?",
+                    (session.status, session.started_at, time.time(), self._row_data(session), session_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return session
+
+    def _set_status(self, session_id: str, data: str, status: str, **fields) -> SessionState:
+        session = SessionState.model_validate_json(data).model_copy(update={**fields, "status": status})
+        self._conn.execute(
+            "UPDATE sessions SET status = ?, started_at = ?, updated_at = ?, data = ? WHERE id = ?",
+            (session.status, session.started_at, time.time(), self._row_data(session), session_id)
+        )
+        return session
+
+    def claim(self, session_id, status, owner, dead_after, **fields):
+        fields = {k: v for k, v in fields.items() if k not in _LAZY_FIELDS}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT s.data, s.status, w.heartbeat_at FROM sessions s "
+                    "LEFT JOIN session_claims c ON c.session_id = s.id "
+                    "LEFT JOIN workers w ON w.id = c.owner WHERE s.id = ?",
+                    (session_id,)
+                ).fetchall()
+                if not rows:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                data, current, heartbeat_at = rows[0]
+                if current in ACTIVE_STATUSES and heartbeat_at is not None and time.time() - heartbeat_at < dead_after:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                session = self._set_status(session_id, data, status, **fields)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO session_claims (session_id, owner) VALUES (?, ?)", (session_id, owner)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return session
+
+    def heartbeat(self, owner):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO workers (id, heartbeat_at) VALUES (?, ?)", (owner, now))
+            # Rows of workers gone for a day only slow the joins down
+            self._conn.execute("DELETE FROM workers WHERE heartbeat_at < ?", (now - 24 * 3600,))
+
+    def retire(self, owner):
+        self._execute("DELETE FROM workers WHERE id = ?", (owner,))
+
+    def release_orphans(self, dead_after):
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT s.id, s.data FROM sessions s "
+                    "LEFT JOIN session_claims c ON c.session_id = s.id "
+                    "LEFT JOIN workers w ON w.id = c.owner "
+                    f"WHERE s.status IN ({placeholders}) AND (w.heartbeat_at IS NULL OR w.heartbeat_at < ?)",
+                    (*ACTIVE_STATUSES, time.time() - dead_after)
+                ).fetchall()
+                for session_id, data in rows:
+                    self._set_status(session_id, data, INTERRUPTED)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [session_id for session_id, _ in rows]
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM session_events WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM session_results WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM session_task_outputs WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM session_claims WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def list(self, status=None, limit=100):
+        if status is None:
+            rows = self._execute("SELECT data FROM sessions ORDER BY started_at DESC LIMIT ?", (limit,))
+        else:
+            rows = self._execute(
+                "SELECT data FROM sessions WHERE status = ? ORDER BY started_at DESC LIMIT ?",
+                (status, limit)
+            )
+        return [SessionState.model_validate_json(row[0]) for row in rows]
+
+    def set_result(self, session_id, result):
+        self._execute(
+            "INSERT OR REPLACE INTO session_results (session_id, result) VALUES (?, ?)",
+            (session_id, result)
+        )
+
+    def get_result(self, session_id):
+        rows = self._execute("SELECT result FROM session_results WHERE session_id = ?", (session_id,))
+        return rows[0][0] if rows else None
+
+    def append_events(self, session_id, events):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute("SELECT last_seq FROM sessions WHERE id = ?", (session_id,)).fetchall()
+                seq = rows[0][0] if rows else 0
+                stored = []
+                for event in events:
+                    seq += 1
+                    stored.append({**event, "seq": seq})
+                self._conn.executemany(
+                    "INSERT INTO session_events (session_id, seq, entry) VALUES (?, ?, ?)",
+                    [(session_id, e["seq"], json.dumps(e, ensure_ascii=False)) for e in stored]
+                )
+                self._conn.execute("UPDATE sessions SET last_seq = ? WHERE id = ?", (seq, session_id))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return stored
+
+    def get_logs(self, session_id, since=0, limit=None):
+        rows = self._execute(
+            "SELECT entry FROM session_events WHERE session_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (session_id, since, -1 if limit is None else limit)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def clear_logs(self, session_id):
+        self._execute("DELETE FROM session_events WHERE session_id = ?", (session_id,))
+
+    def save_task_output(self, session_id, task_index, output):
+        self._execute(
+            "INSERT OR REPLACE INTO session_task_outputs (session_id, task_index, output) VALUES (?, ?, ?)",
+            (session_id, task_index, output)
+        )
+
+    def get_task_outputs(self, session_id):
+        rows = self._execute(
+            "SELECT task_index, output FROM session_task_outputs WHERE session_id = ?", (session_id,)
+        )
+        return {index: output for index, output in rows}
+
+    def clear_task_outputs(self, session_id):
+        self._execute("DELETE FROM session_task_outputs WHERE session_id = ?", (session_id,))
+
+    def evict_expired(self, ttl_seconds):
+        cutoff = time.time() - ttl_seconds
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        rows = self._execute(
+            f"SELECT id FROM sessions WHERE status IN ({placeholders}) AND updated_at < ?",
+            (*TERMINAL_STATUSES, cutoff)
+        )
+        for (session_id,) in rows:
+            self.delete(session_id)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_session_store(kind: str = "sqlite", path: str = "sessions.db") -> SessionStore:
+    """Build the store selected by ``SESSION_STORE``"""
+    if kind == "memory":
+        return MemorySessionStore()
+    if kind == "sqlite":
+        return SQLiteSessionStore(path)
+    raise ValueError(f"Unknown session store: {kind}")
@@ -0,0 +1,65 @@
+"""
+Task Graph - Görev bağımlılıkları ve kritik yol hesabı
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def resolve_dependencies(depends_on: Sequence[Optional[List[int]]]) -> List[List[int]]:
+    """Dependency lists per task index.
+
+    ``None`` keeps the sequential default (the previous task); an empty list
+    marks a task that can start right away.
+    """
+    deps = []
+    for i, declared in enumerate(depends_on):
+        if declared is None:
+            deps.append([i - 1] if i > 0 else [])
+            continue
+        for j in declared:
+            if not 0 <= j < len(depends_on) or j == i:
+                raise ValueError(f"Task {i + 1} has an invalid dependency: {j + 1}")
+        deps.append(sorted(set(declared)))
+    topological_order(deps)
+    return deps
+
+
+def topological_order(deps: List[List[int]]) -> List[int]:
+    """Task indices so that every task comes after its dependencies"""
+    order, state = [], {}
+
+    def visit(i: int, path: Tuple[int, ...]):
+        if state.get(i) == "done":
+            return
+        if state.get(i) == "visiting":
+            cycle = " → ".join(str(t + 1) for t in path + (i,))
+            raise ValueError(f"Task dependencies contain a cycle: {cycle}")
+        state[i] = "visiting"
+        for j in deps[i]:
+            visit(j, path + (i,))
+        state[i] = "done"
+        order.append(i)
+
+    for i in range(len(deps)):
+        visit(i, ())
+    return order
+
+
+def critical_path(deps: List[List[int]], durations: Dict[int, float]) -> Tuple[List[int], float]:
+    """Longest chain of dependent tasks by duration, and its total length"""
+    length: Dict[int, float] = {}
+    previous: Dict[int, Optional[int]] = {}
+    for i in topological_order(deps):
+        best = max(deps[i], key=lambda j: length[j], default=None)
+        previous[i] = best
+        length[i] = durations.get(i, 0.0) + (length[best] if best is not None else 0.0)
+
+    if not length:
+        return [], 0.0
+    end = max(length, key=length.get)
+    path = []
+    node: Optional[int] = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return path[::-1], length[end]
@@ -0,0 +1,90 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+import crew_manager
+import rate_limit
+from crew_manager import AgentConfig, CrewManager, TaskConfig
+from gemini_llm import CrewChatModel
+from llm_cache import DiskLLMCache
+
+REPLY = ["Thought: I know the answer\n", "Final Answer: ", "Merhaba dünya"]
+
+
+@pytest.fixture
+def gemini(monkeypatch, tmp_path):
+    """Fake Gemini transport behind the real RateLimitedGemini, cache and pool"""
+    calls = []
+
+    def fake_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append({"messages": messages, "stop": stop})
+        for part in REPLY:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=part))
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content="", usage_metadata={"input_tokens": 12, "output_tokens": 6, "total_tokens": 18}
+        ))
+
+    monkeypatch.setattr(ChatGoogleGenerativeAI, "_stream", fake_stream)
+    cache = DiskLLMCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(crew_manager, "llm_cache", lambda: cache)
+    monkeypatch.setattr(crew_manager, "llm_pool", crew_manager.ObjectPool())
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    # The last task writes output_<timestamp>.md into the working directory
+    monkeypatch.chdir(tmp_path)
+    return calls, cache
+
+
+def _run_crew(events: list) -> str:
+    manager = CrewManager("gemini-test", events.append, api_key="test-key")
+    manager.add_agent(AgentConfig(name="Yazar", role="Yazar", goal="Yaz", backstory="Deneyimli"))
+    manager.add_task(TaskConfig(description="{topic} hakkında yaz", expected_output="Metin", agent_name="Yazar"))
+    assert isinstance(manager.agents[0].llm, CrewChatModel)
+    return asyncio.run(manager.run("test"))
+
+
+def test_agent_call_goes_through_limiter_cache_and_stream(gemini):
+    calls, cache = gemini
+    events = []
+
+    assert _run_crew(events) == "Merhaba dünya"
+    assert len(calls) == 1
+    assert "\nObservation:" in calls[0]["stop"]
+    assert rate_limit.quota_stats()[0]["calls"] == 1
+
+    types = Counter(event["type"] for event in events)
+    assert types["agent_token"] == len(REPLY)
+    llm_calls = [event for event in events if event["type"] == "llm_call"]
+    assert [(c["agent"], c["prompt_tokens"], c["completion_tokens"], c["cached"]) for c in llm_calls] == [
+        ("Yazar", 12, 6, False)
+    ]
+    assert cache.stats()["misses"] == 1
+
+    # The same prompt again is answered from the disk cache
+    events.clear()
+    assert _run_crew(events) == "Merhaba dünya"
+    assert len(calls) == 1
+    assert rate_limit.quota_stats()[0]["calls"] == 1
+    assert cache.stats()["hits"] == 1
+    assert [event["cached"] for event in events if event["type"] == "llm_call"] == [True]
+
+
+def test_resume_passes_restored_output_with_braces(gemini):
+    calls, _ = gemini
+    manager = CrewManager("gemini-test", [].append, api_key="test-key")
+    manager.add_agent(AgentConfig(name="Yazar", role="Yazar", goal="Yaz", backstory="Deneyimli"))
+    manager.add_task(TaskConfig(description="{topic} için taslak", expected_output="Taslak", agent_name="Yazar"))
+    manager.add_task(TaskConfig(description="Taslağı düzelt", expected_output="Metin", agent_name="Yazar"))
+
+    # Checkpointed output of task 1 holds code with braces, e.g. a format string
+    restored = {0: 'print(f"{x} ve {topic_name}")'}
+    assert asyncio.run(manager.run("test", restored=restored)) == "Merhaba dünya"
+    assert len(calls) == 1
+    prompt = "\n".join(str(message.content) for message in calls[0]["messages"])
+    assert restored[0] in prompt
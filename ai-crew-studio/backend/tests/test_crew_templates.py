@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from crew_templates import BUILTIN_TEMPLATES, CrewTemplate, TemplateRegistry
+
+
+def _data(description: str, variables=None, name: str = "deneme") -> dict:
+    return {
+        "name": name,
+        "title": "Deneme",
+        "description": "Deneme şablonu",
+        "agents": [{"name": "Yazar", "role": "Yazar", "goal": "{topic} hakkında yaz", "backstory": "Deneyimli"}],
+        "tasks": [{"description": description, "expected_output": 'JSON: {"baslik": "..."}', "agent_name": "Yazar"}],
+        "variables": variables or {}
+    }
+
+
+def _template(description: str, variables=None) -> CrewTemplate:
+    return CrewTemplate.from_dict(_data(description, variables))
+
+
+def test_builtin_templates_compile():
+    registry = TemplateRegistry(BUILTIN_TEMPLATES)
+    assert len(registry.list()) == len(BUILTIN_TEMPLATES)
+
+
+def test_variables_are_rendered_and_topic_kept():
+    compiled = TemplateRegistry().register(_template("{topic} için {language} yaz", {"language": "Türkçe"}))
+    assert compiled.tasks[0]["description"] == "{topic} için Türkçe yaz"
+    assert compiled.tasks[0]["expected_output"] == 'JSON: {"baslik": "..."}'
+
+
+def test_misspelt_placeholder_is_rejected():
+    with pytest.raises(ValueError, match="topik"):
+        TemplateRegistry().register(_template("{topik} için yaz"))
+
+
+def test_load_dir_skips_template_with_unknown_placeholder(tmp_path):
+    (tmp_path / "good.json").write_text(json.dumps(_data("{topic} için yaz", name="good")), encoding="utf-8")
+    (tmp_path / "bad.json").write_text(json.dumps(_data("{language} yaz", name="bad")), encoding="utf-8")
+
+    registry = TemplateRegistry()
+    assert registry.load_dir(str(tmp_path)) == 1
+    assert registry.get("good") is not None and registry.get("bad") is None
@@ -0,0 +1,68 @@
+import pytest
+
+import session_store
+from session_store import INTERRUPTED, MemorySessionStore, SessionState, SQLiteSessionStore
+
+DEAD_AFTER = 30
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def restart(request, tmp_path):
+    """Returns a function handing out the store as a freshly booted worker sees it"""
+    path = str(tmp_path / "sessions.db")
+    memory = MemorySessionStore()
+    stores = []
+
+    def boot():
+        store = SQLiteSessionStore(path) if request.param == "sqlite" else memory
+        stores.append(store)
+        return store
+
+    yield boot
+    for store in stores:
+        store.close()
+
+
+def _start_run(store, owner):
+    store.heartbeat(owner)
+    store.create(SessionState(id="s1", status="created"))
+    assert store.claim("s1", "queued", owner, DEAD_AFTER) is not None
+    store.update("s1", status="running")
+
+
+def test_live_owner_keeps_its_claim(restart):
+    store = restart()
+    _start_run(store, "boot-1")
+
+    assert store.claim("s1", "queued", "boot-2", DEAD_AFTER) is None
+    assert store.release_orphans(DEAD_AFTER) == []
+    assert store.get("s1").status == "running"
+
+
+def test_restart_takes_over_run_of_dead_worker(restart, monkeypatch):
+    _start_run(restart(), "boot-1")
+
+    # boot-1 crashed mid-run: it never retires and its heartbeat goes stale
+    store = restart()
+    store.heartbeat("boot-2")
+    assert store.claim("s1", "queued", "boot-2", DEAD_AFTER) is None
+    now = session_store.time.time()
+    monkeypatch.setattr(session_store.time, "time", lambda: now + DEAD_AFTER + 1)
+
+    store.heartbeat("boot-2")
+    assert store.release_orphans(DEAD_AFTER) == ["s1"]
+    assert store.get("s1").status == INTERRUPTED
+    assert store.claim("s1", "queued", "boot-2", DEAD_AFTER).status == "queued"
+    # Now held by a live worker again
+    assert store.claim("s1", "queued", "boot-3", DEAD_AFTER) is None
+
+
+def test_retired_worker_releases_runs_at_once(restart):
+    old = restart()
+    _start_run(old, "boot-1")
+    old.retire("boot-1")
+
+    store = restart()
+    store.heartbeat("boot-2")
+    assert store.release_orphans(DEAD_AFTER) == ["s1"]
+    assert store.claim("s1", "queued", "boot-2", DEAD_AFTER) is not None
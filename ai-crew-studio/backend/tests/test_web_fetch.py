@@ -0,0 +1,115 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import web_fetch
+from web_fetch import PageFetcher, available_parser, extract_text
+
+PAGE = "<html><body><script>var x = 1;</script>\n<h1>Başlık</h1>\n<p>Merhaba  dünya</p></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == "/big":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            try:
+                for _ in range(256):
+                    self.wfile.write(b"x" * 4096)
+            except OSError:
+                # The fetcher closes the connection once it has enough
+                pass
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path="/page"):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_fresh_pages_are_served_without_a_request(server, tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path), fresh_seconds=300)
+    assert fetcher.fetch_with_source(_url(server)) == (PAGE, "network")
+    assert fetcher.fetch_with_source(_url(server)) == (PAGE, "fresh")
+    assert len(server.requests) == 1
+
+
+def test_stale_pages_are_revalidated_with_etag(server, tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path), fresh_seconds=0)
+    assert fetcher.fetch_with_source(_url(server))[1] == "network"
+    body, source = fetcher.fetch_with_source(_url(server))
+    assert (body, source) == (PAGE, "revalidated")
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert fetcher.stats["revalidated"] == 1
+
+
+def test_body_is_cut_at_max_bytes(server, tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path), max_bytes=10 * 1024)
+    body = fetcher.fetch(_url(server, "/big"))
+    assert len(body) == 10 * 1024
+
+
+def test_parser_fallback_to_html_parser(monkeypatch):
+    monkeypatch.setattr(web_fetch, "_SelectolaxParser", None)
+    monkeypatch.setattr(web_fetch, "_lxml_html", None)
+    assert available_parser() == "html.parser"
+    assert extract_text(PAGE) == "Başlık\nMerhaba\ndünya"
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_parsers_drop_scripts(parser):
+    if parser == "lxml" and web_fetch._lxml_html is None:
+        pytest.skip("lxml is not installed")
+    text = extract_text(PAGE, parser=parser)
+    assert "var x" not in text
+    assert "Başlık" in text
+    assert extract_text(PAGE, max_chars=4, parser=parser) == "Başl"
+
+
+def test_cache_eviction_by_age_and_size(server, tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path), cache_ttl_seconds=3600, max_cache_bytes=10 ** 6)
+    for i in range(4):
+        fetcher.fetch(_url(server, f"/page{i}"))
+    paths = sorted(tmp_path.iterdir())
+    now = time.time()
+    for age, path in enumerate(paths):
+        os.utime(path, (now - age * 60, now - age * 60))
+    os.utime(paths[0], (now - 7200, now - 7200))
+
+    assert fetcher.evict_cache() == 1
+    assert not paths[0].exists()
+
+    # Room for two pages: the least recently stored go first
+    fetcher.max_cache_bytes = paths[1].stat().st_size + paths[2].stat().st_size
+    assert fetcher.evict_cache() == 1
+    assert [p.exists() for p in paths[1:]] == [True, True, False]
+    assert fetcher.stats["evicted"] == 2
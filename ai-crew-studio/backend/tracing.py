@@ -0,0 +1,118 @@
+"""
+Tracing - Ekip akışı için span kaydı (JSON satırları olarak dosyaya)
+"""
+
+import os
+import json
+import time
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+# Spans are appended here as JSON lines; tracing is off when unset
+TRACE_FILE = os.environ.get("TRACE_FILE", "")
+
+T = TypeVar("T")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "attributes", "start_time", "status")
+
+    def __init__(self, name: str, parent: Optional["Span"], trace_id: Optional[str], attributes: dict):
+        self.trace_id = parent.trace_id if parent else (trace_id or secrets.token_hex(16))
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+
+class _FileExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span, end_time: float):
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_span_id": span.parent_span_id,
+            "name": span.name,
+            "start_time": span.start_time,
+            "end_time": end_time,
+            "duration_ms": round((end_time - span.start_time) * 1000, 3),
+            "status": span.status,
+            "attributes": span.attributes
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+
+_exporter = _FileExporter(TRACE_FILE) if TRACE_FILE else None
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span; pass it as ``parent`` to continue a trace in another thread"""
+    return _current.get()
+
+
+def trace_id_for(key: str) -> str:
+    """Stable trace id, e.g. one trace per session id"""
+    return key.replace("-", "")[:32].ljust(32, "0")
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, trace_id: Optional[str] = None,
+         **attributes) -> Iterator[Optional[Span]]:
+    """Record the enclosed block as a span; a no-op when TRACE_FILE is unset.
+
+    The parent defaults to the current span of this context. Threads started
+    with ``run_in_executor`` don't inherit it, so pass ``parent`` there.
+    """
+    if _exporter is None:
+        yield None
+        return
+
+    opened = Span(name, parent or _current.get(), trace_id, attributes)
+    token = _current.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.status = "error"
+        opened.attributes["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        _exporter.export(opened, time.time())
+
+
+def record(name: str, start_time: float, end_time: Optional[float] = None,
+           parent: Optional[Span] = None, trace_id: Optional[str] = None, **attributes):
+    """Export an already finished span, e.g. one measured by callbacks"""
+    if _exporter is None:
+        return
+    finished = Span(name, parent, trace_id, attributes)
+    finished.start_time = start_time
+    _exporter.export(finished, end_time if end_time is not None else time.time())
+
+
+async def traced(awaitable: Awaitable[T], name: str, **kwargs) -> T:
+    """Await ``awaitable`` inside a span (arguments as for ``span``)"""
+    with span(name, **kwargs):
+        return await awaitable
@@ -0,0 +1,218 @@
+"""
+Web Fetch - Bağlantı havuzlu, önbellekli sayfa indirme ve metin çıkarma
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fastest available HTML parser: selectolax > lxml > BeautifulSoup(html.parser)
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+try:
+    import lxml.html as _lxml_html
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_html = None
+
+USER_AGENT = "Mozilla/5.0 (compatible; AICrewStudio/1.0)"
+
+
+def _raw_text(html: str, parser: str) -> str:
+    if parser == "selectolax":
+        tree = _SelectolaxParser(html)
+        for node in tree.css("script, style, noscript"):
+            node.decompose()
+        root = tree.body or tree.root
+        return root.text(separator="\n") if root else ""
+    if parser == "lxml":
+        doc = _lxml_html.fromstring(html)
+        _lxml_etree.strip_elements(doc, "script", "style", "noscript", with_tail=False)
+        return "\n".join(doc.itertext())
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return soup.get_text()
+
+
+def _chunks(text: str) -> Iterator[str]:
+    for line in text.splitlines():
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                yield phrase
+
+
+def available_parser() -> str:
+    if _SelectolaxParser is not None:
+        return "selectolax"
+    if _lxml_html is not None:
+        return "lxml"
+    return "html.parser"
+
+
+def extract_text(html: str, max_chars: int = 3000, parser: Optional[str] = None) -> str:
+    """Visible text, one phrase per line, cut at ``max_chars``"""
+    parts, size = [], 0
+    for chunk in _chunks(_raw_text(html, parser or available_parser())):
+        parts.append(chunk)
+        size += len(chunk) + 1
+        if size >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+
+class PageFetcher:
+    """HTTP fetcher shared by every scraper call in the process.
+
+    Connections are pooled per host. Bodies are read in a stream and cut at
+    ``max_bytes`` so huge pages are never fully downloaded. Pages are kept in
+    ``cache_dir``: within ``fresh_seconds`` they are served without a request,
+    after that they are revalidated with ETag / Last-Modified. ``evict_cache``
+    drops pages older than ``cache_ttl_seconds`` and keeps the directory under
+    ``max_cache_bytes``.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = "page_cache", max_bytes: int = 512 * 1024,
+                 timeout: float = 10, fresh_seconds: float = 300, pool_size: int = 16,
+                 cache_ttl_seconds: float = 7 * 24 * 3600, max_cache_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_cache_bytes = max_cache_bytes
+        self.timeout = timeout
+        self.fresh_seconds = fresh_seconds
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "fresh_hits": 0, "revalidated": 0, "evicted": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def fetch(self, url: str) -> str:
+        """HTML of ``url``, from the cache when it is still valid"""
+        return self.fetch_with_source(url)[0]
+
+    def fetch_with_source(self, url: str) -> Tuple[str, str]:
+        """HTML of ``url`` and where it came from: ``fresh``, ``revalidated`` or ``network``"""
+        cached = self._load(url)
+        if cached and time.time() - cached["fetched_at"] < self.fresh_seconds:
+            self._count("fresh_hits")
+            return cached["body"], "fresh"
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        self._count("requests")
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and cached:
+                self._count("revalidated")
+                cached["fetched_at"] = time.time()
+                self._store(url, cached)
+                return cached["body"], "revalidated"
+            response.raise_for_status()
+            body = self._read_capped(response)
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "body": body
+            }
+        self._store(url, entry)
+        return body, "network"
+
+    def fetch_text(self, url: str, max_chars: int = 3000) -> str:
+        return extract_text(self.fetch(url), max_chars)
+
+    def _read_capped(self, response: requests.Response) -> str:
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            data.extend(chunk)
+            if len(data) >= self.max_bytes:
+                break
+        content_type = response.headers.get("Content-Type", "")
+        encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+        return bytes(data[:self.max_bytes]).decode(encoding or "utf-8", errors="replace")
+
+    def evict_cache(self) -> int:
+        """Delete expired pages, then the least recently stored ones until under the size cap"""
+        if not self.cache_dir:
+            return 0
+        cutoff = time.time() - self.cache_ttl_seconds
+        kept, total, evicted = [], 0, 0
+        for entry in os.scandir(self.cache_dir):
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                # Leftover temp files of interrupted writes count as expired
+                if stat.st_mtime < cutoff or (entry.name.endswith(".tmp") and stat.st_mtime < time.time() - 60):
+                    os.unlink(entry.path)
+                    evicted += 1
+                elif entry.name.endswith(".json"):
+                    kept.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            except OSError:
+                pass
+        kept.sort()
+        for _, size, path in kept:
+            if total <= self.max_cache_bytes:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except OSError:
+                pass
+            total -= size
+        with self._lock:
+            self.stats["evicted"] += evicted
+        return evicted
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _load(self, url: str) -> Optional[dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, url: str, entry: dict):
+        if not self.cache_dir:
+            return
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            pass
@@ -17,6 +17,8 @@ import {
   AlertCircle,
   PartyPopper,
   X,
+  Square,
+  RotateCcw,
   Terminal
 } from 'lucide-react'
 import { useAppStore } from '../store/useAppStore'
@@ -58,7 +60,11 @@ export default function ExecutionPage() {
     isRunning,
     status,
     result,
-    startCrew
+    liveOutput,
+    liveAgent,
+    startCrew,
+    resumeCrew,
+    cancelCrew
   } = useAppStore()
   const { apiKey } = useSettingsStore()
   
@@ -392,6 +398,19 @@ export default function ExecutionPage() {
             </div>
           </div>
           
+          {/* Live LLM output of the agent that is currently writing */}
+          {isRunning && liveAgent && (
+            <div className="glass rounded-2xl p-4 border border-dark-700">
+              <div className="flex items-center gap-2 mb-2 text-sm text-dark-400">
+                <Brain className="w-4 h-4 text-primary-500" />
+                {liveAgent} yazıyor...
+              </div>
+              <pre className="text-xs text-dark-300 whitespace-pre-wrap max-h-40 overflow-y-auto font-mono">
+                {(liveOutput[liveAgent] || '').slice(-2000)}
+              </pre>
+            </div>
+          )}
+          
           {/* Start/View Result Button */}
           <div className="text-center">
             {!isRunning && status !== 'completed' && status !== 'running' && (
@@ -404,10 +423,27 @@ export default function ExecutionPage() {
               </button>
             )}
             
+            {!isRunning && (status === 'error' || status === 'cancelled') && (
+              <button
+                onClick={resumeCrew}
+                className="mt-3 px-6 py-3 rounded-xl border border-primary-500/40 text-primary-300 font-medium flex items-center gap-2 mx-auto hover:bg-primary-500/10 transition-all"
+              >
+                <RotateCcw className="w-5 h-5" />
+                Kaldığı Yerden Devam Et
+              </button>
+            )}
+            
             {isRunning && (
               <div className="flex items-center justify-center gap-3 text-primary-400">
                 <Loader2 className="w-6 h-6 animate-spin" />
                 <span>Ajanlar çalışıyor...</span>
+                <button
+                  onClick={cancelCrew}
+                  className="ml-4 px-4 py-2 rounded-lg border border-red-500/40 text-red-400 text-sm flex items-center gap-2 hover:bg-red-500/10 transition-all"
+                >
+                  <Square className="w-4 h-4" />
+                  Durdur
+                </button>
               </div>
             )}
             
@@ -17,10 +17,16 @@ export const useAppStore = create((set, get) => ({
   // Execution state
   logs: [],
   result: null,
+  // result_chunk frames received so far for the running crew
+  resultParts: [],
   isRunning: false,
+  // Streamed LLM output per agent, and the agent that streamed last
+  liveOutput: {},
+  liveAgent: null,
 
   // WebSocket
   ws: null,
+  lastSeq: 0,
 
   // Available options
   availableModels: [],
@@ -115,7 +121,9 @@ export const useAppStore = create((set, get) => ({
   },
 
   connectWebSocket: (sessionId) => {
-    const wsUrl = `ws://${window.location.host}/ws/${sessionId}`;
+    // Resume from the last event we saw so a reconnect only gets the gap
+    const { lastSeq } = get();
+    const wsUrl = `ws://${window.location.host}/ws/${sessionId}?since=${lastSeq}`;
     const ws = new WebSocket(wsUrl);
 
     ws.onopen = () => {
@@ -133,15 +141,31 @@ export const useAppStore = create((set, get) => ({
 
     ws.onclose = () => {
       console.log("WebSocket closed");
+      const { ws: current, sessionId: activeSession } = get();
+      // Reconnect unless the socket was replaced or the session was reset
+      if (current === ws && activeSession === sessionId) {
+        setTimeout(() => {
+          if (get().ws === ws) get().connectWebSocket(sessionId);
+        }, 1000);
+      }
     };
 
     set({ ws });
   },
 
   handleWebSocketMessage: (message) => {
-    const { addLog } = get();
+    const { addLog, lastSeq } = get();
+
+    if (message.seq) {
+      if (message.seq <= lastSeq) return;
+      set({ lastSeq: message.seq });
+    }
 
     switch (message.type) {
+      case "batch":
+        message.events.forEach((event) => get().handleWebSocketMessage(event));
+        break;
+
       case "agent_started":
       case "agent_thinking":
       case "agent_action":
@@ -152,23 +176,44 @@ export const useAppStore = create((set, get) => ({
       case "task_executing":
       case "task_created":
       case "agent_created":
+      case "queue_update":
+      case "events_dropped":
       case "execution_error":
+      case "task_completed":
+      case "task_restored":
+      case "rate_limited":
+      case "crew_timing":
         console.log(`Log: [${message.type}]`, message.message || message);
         addLog(message);
         break;
 
+      case "result_chunk": {
+        // The result arrives in fixed-size pieces just before crew_completed
+        const parts = [...get().resultParts];
+        parts[message.index] = message.data;
+        set({ resultParts: parts });
+        if (parts.filter((part) => part !== undefined).length === message.total) {
+          set({ result: parts.join(""), resultParts: [] });
+        }
+        break;
+      }
+
       case "crew_completed":
         console.log("Crew completed!", message);
-        console.log(
-          "Result received:",
-          message.result?.substring(0, 100) + "..."
-        );
         set({
-          result: message.result || "Sonuç alınamadı",
           isRunning: false,
           status: "completed",
           currentStep: 5,
         });
+        if (message.download_url && !get().result) {
+          // Some chunks were missed; load the result over HTTP
+          get().fetchResult();
+        }
+        addLog(message);
+        break;
+
+      case "crew_cancelled":
+        set({ isRunning: false, status: "cancelled" });
         addLog(message);
         break;
 
@@ -182,6 +227,21 @@ export const useAppStore = create((set, get) => ({
         set({ currentStep: message.step });
         break;
 
+      case "llm_call":
+      case "tool_call":
+        // Accounting events; they are summed up in /stats
+        break;
+
+      case "agent_token":
+        set((state) => ({
+          liveAgent: message.agent,
+          liveOutput: {
+            ...state.liveOutput,
+            [message.agent]: (state.liveOutput[message.agent] || "") + message.token,
+          },
+        }));
+        break;
+
       default:
         console.log("Unknown message type:", message.type);
     }
@@ -253,7 +313,7 @@ export const useAppStore = create((set, get) => ({
     const { sessionId, topic } = get();
     if (!sessionId) return;
 
-    set({ isRunning: true, status: "running", logs: [] });
+    set({ isRunning: true, status: "running", logs: [], result: null, resultParts: [], liveOutput: {}, liveAgent: null });
 
     try {
       // First, set the API key for this session
@@ -265,11 +325,15 @@ export const useAppStore = create((set, get) => ({
         });
       }
 
-      await fetch(`${API_BASE}/sessions/${sessionId}/start`, {
+      const res = await fetch(`${API_BASE}/sessions/${sessionId}/start`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ topic }),
       });
+      if (!res.ok) {
+        const data = await res.json().catch(() => ({}));
+        throw new Error(data.detail || `Start failed: ${res.status}`);
+      }
     } catch (err) {
       console.error("Failed to start crew:", err);
       set({ isRunning: false, status: "error" });
@@ -277,6 +341,42 @@ export const useAppStore = create((set, get) => ({
     }
   },
 
+  resumeCrew: async () => {
+    const { sessionId, topic } = get();
+    if (!sessionId) return;
+
+    // Logs are kept: the resumed run continues the same session log
+    set({ isRunning: true, status: "running", result: null, resultParts: [], liveOutput: {}, liveAgent: null });
+
+    try {
+      const res = await fetch(`${API_BASE}/sessions/${sessionId}/resume`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(topic ? { topic } : {}),
+      });
+      if (!res.ok) {
+        const data = await res.json().catch(() => ({}));
+        throw new Error(data.detail || `Resume failed: ${res.status}`);
+      }
+    } catch (err) {
+      console.error("Failed to resume crew:", err);
+      set({ isRunning: false, status: "error" });
+      throw err;
+    }
+  },
+
+  cancelCrew: async () => {
+    const { sessionId } = get();
+    if (!sessionId) return;
+
+    try {
+      // The crew stops at its next task, tool or LLM call; crew_cancelled follows
+      await fetch(`${API_BASE}/sessions/${sessionId}/cancel`, { method: "POST" });
+    } catch (err) {
+      console.error("Failed to cancel crew:", err);
+    }
+  },
+
   fetchResult: async () => {
     const { sessionId } = get();
     if (!sessionId) {
@@ -289,7 +389,10 @@ export const useAppStore = create((set, get) => ({
         "fetchResult: Fetching from",
         `${API_BASE}/sessions/${sessionId}/result`
       );
-      const res = await fetch(`${API_BASE}/sessions/${sessionId}/result`);
+      const { lastSeq, addLog } = get();
+      const res = await fetch(
+        `${API_BASE}/sessions/${sessionId}/result?since=${lastSeq}`
+      );
       const data = await res.json();
       console.log("fetchResult: Received data:", {
         status: data.status,
@@ -298,6 +401,22 @@ export const useAppStore = create((set, get) => ({
         resultPreview: data.result?.substring(0, 100) || "NULL",
       });
 
+      // Only events we have not seen yet are returned
+      (data.logs || []).forEach((log) => {
+        if (log.seq > get().lastSeq) {
+          set({ lastSeq: log.seq });
+          addLog(log);
+        }
+      });
+
+      if (!data.result && data.download_url) {
+        // Large results are not inlined; download the file instead
+        const download = await fetch(`${API_BASE}/sessions/${sessionId}/result/download`);
+        if (download.ok) {
+          data.result = await download.text();
+        }
+      }
+
       if (data.result) {
         set({ result: data.result, status: data.status });
       } else {
@@ -324,8 +443,12 @@ export const useAppStore = create((set, get) => ({
       topic: "",
       logs: [],
       result: null,
+      resultParts: [],
       isRunning: false,
+      liveOutput: {},
+      liveAgent: null,
       ws: null,
+      lastSeq: 0,
     });
   },
 }));
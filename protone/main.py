@@ -1,8 +1,10 @@
 import os
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.tools import BaseTool
-from langchain_google_genai import ChatGoogleGenerativeAI
-from duckduckgo_search import DDGS
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# crewai, langchain ve duckduckgo_search ağır paketler; ilk kullanıldıkları
+# fonksiyonda yüklenir, böylece --help gibi komutlar beklemeden çalışır.
 
 # 1. AYARLAR
 # Google API Anahtarını buraya gir (Eğer sistem değişkenlerinde yoksa)
@@ -12,96 +14,148 @@ os.environ["OPENAI_API_KEY"] = "NA"
 
 # Gemini bazen internet verilerini "tehlikeli" sanıp yanıt vermeyi kesiyor.
 # Bu ayarlar filtreleri tamamen kapatır ve modelin her zaman cevap vermesini sağlar.
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash-lite",
-    verbose=True,
-    temperature=0.5,
-    google_api_key=os.environ["GOOGLE_API_KEY"]
-)
+def build_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash-lite",
+        verbose=True,
+        temperature=0.5,
+        google_api_key=os.environ["GOOGLE_API_KEY"]
+    )
 
 # --- 3. ÖZEL TOOL TANIMI ---
-class InternetSearchTool(BaseTool):
-    name: str = "Internet Search"
-    description: str = "İnternette güncel konuları aramak için kullanılır."
-
-    def _run(self, query: str) -> str:
-        try:
-            # max_results=3 yaparak modelin kafasının karışmasını önlüyoruz
-            with DDGS() as ddgs:
-                results = [r for r in ddgs.text(query, max_results=3)]
-                return str(results)
-        except Exception as e:
-            return f"Arama hatası: {str(e)}"
-
-search_tool = InternetSearchTool()
-
-# --- 4. AJANLARI TANIMLA ---
-
-researcher = Agent(
-    role='Kıdemli Teknoloji Araştırmacısı',
-    goal='Konu hakkında internetteki en güncel gelişmeleri bulmak.',
-    backstory="""Teknoloji trendlerini takip eden araştırmacısın. 
-    İnterneti tarayıp en doğru bilgiyi bulursun.""",
-    verbose=True,
-    allow_delegation=False,
-    tools=[search_tool],
-    llm=llm
-)
-
-writer = Agent(
-    role='Teknoloji Blog Yazarı',
-    goal='Araştırma verilerini kullanarak Türkçe blog yazısı yazmak.',
-    backstory="""Karmaşık teknik konuları basit bir dile çevirirsin.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
-
-editor = Agent(
-    role='Baş Editör',
-    goal='Yazıyı dilbilgisi ve yapısal olarak mükemmelleştirmek.',
-    backstory="""Yazının Türkçe imla kurallarına uygunluğunu kontrol edersin.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
-
-# --- 5. GÖREVLERİ TANIMLA ---
-
-task_research = Task(
-    description="""'{topic}' konusu hakkında 2024-2025 yıllarındaki trendleri araştır.""",
-    expected_output="Önemli noktaların bulunduğu özet rapor.",
-    agent=researcher
-)
-
-task_write = Task(
-    description="""Araştırma raporunu kullanarak '{topic}' hakkında blog yazısı yaz. Türkçe olsun.""",
-    expected_output="Markdown formatında blog yazısı.",
-    agent=writer
-)
-
-task_edit = Task(
-    description="""Yazıyı kontrol et. Sonuna 'Yazar: AI Team' ekle.""",
-    expected_output="Final blog yazısı.",
-    agent=editor,
-    output_file='final_makale_gemini.md'
-)
-
-# --- 6. ÇALIŞTIR ---
-
-crew = Crew(
-    agents=[researcher, writer, editor],
-    tasks=[task_research, task_write, task_edit],
-    verbose=True,
-    process=Process.sequential
-)
+def build_search_tool():
+    from crewai.tools import BaseTool
+    from duckduckgo_search import DDGS
+
+    class InternetSearchTool(BaseTool):
+        name: str = "Internet Search"
+        description: str = "İnternette güncel konuları aramak için kullanılır."
+
+        def _run(self, query: str) -> str:
+            try:
+                # max_results=3 yaparak modelin kafasının karışmasını önlüyoruz
+                with DDGS() as ddgs:
+                    results = [r for r in ddgs.text(query, max_results=3)]
+                    return str(results)
+            except Exception as e:
+                return f"Arama hatası: {str(e)}"
+
+    return InternetSearchTool()
+
+# --- 4. EKİBİ KUR (Ajanlar + Görevler) ---
+# Her konu kendi ekibini alır; LLM ve arama aracı tüm konular arasında paylaşılır.
+
+def build_crew(llm, search_tool, output_file='final_makale_gemini.md'):
+    from crewai import Agent, Task, Crew, Process
+
+    researcher = Agent(
+        role='Kıdemli Teknoloji Araştırmacısı',
+        goal='Konu hakkında internetteki en güncel gelişmeleri bulmak.',
+        backstory="""Teknoloji trendlerini takip eden araştırmacısın. 
+        İnterneti tarayıp en doğru bilgiyi bulursun.""",
+        verbose=True,
+        allow_delegation=False,
+        tools=[search_tool],
+        llm=llm
+    )
+
+    writer = Agent(
+        role='Teknoloji Blog Yazarı',
+        goal='Araştırma verilerini kullanarak Türkçe blog yazısı yazmak.',
+        backstory="""Karmaşık teknik konuları basit bir dile çevirirsin.""",
+        verbose=True,
+        allow_delegation=False,
+        llm=llm
+    )
+
+    editor = Agent(
+        role='Baş Editör',
+        goal='Yazıyı dilbilgisi ve yapısal olarak mükemmelleştirmek.',
+        backstory="""Yazının Türkçe imla kurallarına uygunluğunu kontrol edersin.""",
+        verbose=True,
+        allow_delegation=False,
+        llm=llm
+    )
+
+    task_research = Task(
+        description="""'{topic}' konusu hakkında 2024-2025 yıllarındaki trendleri araştır.""",
+        expected_output="Önemli noktaların bulunduğu özet rapor.",
+        agent=researcher
+    )
+
+    task_write = Task(
+        description="""Araştırma raporunu kullanarak '{topic}' hakkında blog yazısı yaz. Türkçe olsun.""",
+        expected_output="Markdown formatında blog yazısı.",
+        agent=writer
+    )
+
+    task_edit = Task(
+        description="""Yazıyı kontrol et. Sonuna 'Yazar: AI Team' ekle.""",
+        expected_output="Final blog yazısı.",
+        agent=editor,
+        output_file=output_file
+    )
+
+    return Crew(
+        agents=[researcher, writer, editor],
+        tasks=[task_research, task_write, task_edit],
+        verbose=True,
+        process=Process.sequential
+    )
+
+# --- 5. ÇALIŞTIR ---
+
+def run_topic(llm, search_tool, topic, output_file):
+    try:
+        build_crew(llm, search_tool, output_file).kickoff(inputs={'topic': topic})
+        return {"topic": topic, "status": "completed", "output_file": output_file}
+    except Exception as e:
+        return {"topic": topic, "status": "error", "error": str(e)}
+
+def run_batch(topics, workers=2):
+    """Her konu için ekibi çalıştırır, en fazla ``workers`` konu aynı anda"""
+    llm = build_llm()
+    search_tool = build_search_tool()
+    if len(topics) == 1:
+        output_files = ['final_makale_gemini.md']
+    else:
+        output_files = [f'final_makale_gemini_{i + 1:02d}.md' for i in range(len(topics))]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(lambda args: run_topic(llm, search_tool, *args), zip(topics, output_files)))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Yapay Zeka blog ekibi")
+    parser.add_argument("topics", nargs="*", help="Yazı konuları (her biri ayrı makale)")
+    parser.add_argument("--topics-file", help="Her satırında bir konu olan dosya")
+    parser.add_argument("--workers", type=int, default=2, help="Aynı anda çalışacak konu sayısı")
+    parser.add_argument("--manifest", help="Sonuç özetinin yazılacağı JSON dosyası")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    print("🤖 Yapay Zeka Ekibi Başlatılıyor...")
-    # Konuyu biraz daha genel yapalım ki daha rahat veri bulsun
-    topic = "Yapay Zeka (AI) Teknolojileri" 
-    result = crew.kickoff(inputs={'topic': topic})
+    args = parse_args()
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file, encoding="utf-8") as f:
+            topics += [line.strip() for line in f if line.strip()]
+    if not topics:
+        # Konuyu biraz daha genel yapalım ki daha rahat veri bulsun
+        topics = ["Yapay Zeka (AI) Teknolojileri"]
+
+    print(f"🤖 Yapay Zeka Ekibi Başlatılıyor... ({len(topics)} konu)")
+    manifest = run_batch(topics, args.workers)
 
     print("\n########################")
     print("## İŞLEM TAMAMLANDI ##")
-    print("########################\n")
\ No newline at end of file
+    print("########################\n")
+    for item in manifest:
+        if item["status"] == "completed":
+            print(f"✅ {item['topic']} → {item['output_file']}")
+        else:
+            print(f"❌ {item['topic']}: {item['error']}")
+
+    if args.manifest:
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)